@@ -11,7 +11,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # импорт настроек и моделей
 from app.db.base import Base
-from app.models import user, team, application, competition, match
+from app.models import user, team, application, competition, match, idempotency, roster
 
 # Alembic Config object
 config = context.config
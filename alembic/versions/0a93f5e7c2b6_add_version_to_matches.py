@@ -0,0 +1,31 @@
+"""add version to matches
+
+Revision ID: 0a93f5e7c2b6
+Revises: f2b8c4d61e57
+Create Date: 2026-10-18 17:31:40.557102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a93f5e7c2b6'
+down_revision: Union[str, None] = 'f2b8c4d61e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'matches',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matches', 'version')
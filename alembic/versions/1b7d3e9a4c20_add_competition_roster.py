@@ -0,0 +1,181 @@
+"""add competition roster
+
+Revision ID: 1b7d3e9a4c20
+Revises: 0a93f5e7c2b6
+Create Date: 2026-10-18 19:02:13.448210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7d3e9a4c20'
+down_revision: Union[str, None] = '0a93f5e7c2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'competition_roster',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('competition_id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=10), nullable=False),
+        sa.Column('participant_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('first_name', sa.String(length=100), nullable=True),
+        sa.Column('middle_name', sa.String(length=100), nullable=True),
+        sa.Column('gender', sa.String(length=1), nullable=True),
+        sa.Column('birth_date', sa.Date(), nullable=True),
+        sa.Column('weight', sa.Integer(), nullable=True),
+        sa.Column('weight_class', sa.String(length=10), nullable=False),
+        sa.Column('age_category', sa.String(length=10), nullable=False),
+        sa.Column('country_id', sa.Integer(), nullable=True),
+        sa.Column('city_id', sa.Integer(), nullable=True),
+        sa.Column('rank', sa.String(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('application_status', sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['competition_id'], ['competitions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'participant_id', name='uq_competition_roster_source_participant'),
+    )
+    op.create_index(
+        'ix_competition_roster_category',
+        'competition_roster',
+        ['competition_id', 'weight_class', 'age_category', 'last_name'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_competition_roster_country',
+        'competition_roster',
+        ['competition_id', 'country_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_competition_roster_application_id',
+        'competition_roster',
+        ['application_id'],
+        unique=False,
+    )
+
+    # заполнение существующими заявками — один INSERT ... SELECT; схема и
+    # правила категорий зафиксированы здесь на момент этой ревизии
+    op.execute(_backfill_statement())
+
+
+# --- заполнение: снимок таблиц и правил категорий (app/services/brackets.py) ---
+
+_WEIGHT_CLASSES = {
+    'M': (60, 66, 73, 81, 90, 100),
+    'F': (48, 52, 57, 63, 70, 78),
+}
+_AGE_CATEGORIES = (
+    ('U15', 0, 14),
+    ('U18', 15, 17),
+    ('U21', 18, 20),
+    ('Senior', 21, 200),
+)
+
+_roster = sa.table(
+    'competition_roster',
+    *(sa.column(name) for name in (
+        'competition_id', 'application_id', 'source', 'participant_id', 'user_id', 'team_id',
+        'last_name', 'first_name', 'middle_name', 'gender', 'birth_date', 'weight',
+        'weight_class', 'age_category', 'country_id', 'city_id', 'rank',
+        'status', 'application_status',
+    )),
+)
+_applications = sa.table(
+    'applications',
+    sa.column('id'), sa.column('competition_id'), sa.column('team_id'), sa.column('status'),
+)
+_competitions = sa.table('competitions', sa.column('id'), sa.column('start_date', sa.DateTime()))
+_individual = sa.table(
+    'application_individual_participants',
+    sa.column('id'), sa.column('application_id'), sa.column('user_id'), sa.column('status'),
+)
+_team = sa.table(
+    'application_team_participants',
+    sa.column('id'), sa.column('application_id'), sa.column('last_name'), sa.column('first_name'),
+    sa.column('middle_name'), sa.column('birth_date', sa.Date()), sa.column('weight'),
+    sa.column('country_id'), sa.column('city_id'), sa.column('status'),
+)
+_users = sa.table(
+    'users',
+    sa.column('id'), sa.column('last_name'), sa.column('first_name'), sa.column('middle_name'),
+    sa.column('birth_date', sa.Date()), sa.column('country_id'), sa.column('city_id'),
+    sa.column('additional_info_id'),
+)
+_info = sa.table(
+    'additional_info',
+    sa.column('id'), sa.column('gender', sa.String()), sa.column('weight'), sa.column('rank'),
+)
+
+
+def _weight_class(gender, weight):
+    whens = [(weight.is_(None), 'open')]
+    for g, limits in _WEIGHT_CLASSES.items():
+        if g == 'M':
+            continue
+        whens += [(sa.and_(gender == g, weight <= limit), f'-{limit}') for limit in limits]
+        whens.append((gender == g, f'+{limits[-1]}'))
+    whens += [(weight <= limit, f'-{limit}') for limit in _WEIGHT_CLASSES['M']]
+    return sa.case(*whens, else_=f"+{_WEIGHT_CLASSES['M'][-1]}")
+
+
+def _age_category(birth_date, on_date):
+    age = sa.extract('year', on_date) - sa.extract('year', birth_date)
+    whens = [(birth_date.is_(None), 'Senior')]
+    whens += [(age.between(low, high), name) for name, low, high in _AGE_CATEGORIES]
+    return sa.case(*whens, else_='Senior')
+
+
+def _backfill_statement():
+    a, c, p, t, u, i = _applications, _competitions, _individual, _team, _users, _info
+    gender = sa.func.upper(sa.func.substr(i.c.gender, 1, 1))
+    no_gender = sa.literal(None, sa.String(1))
+    individual = (
+        sa.select(
+            a.c.competition_id, a.c.id, sa.literal('individual'), p.c.id, p.c.user_id, a.c.team_id,
+            u.c.last_name, u.c.first_name, u.c.middle_name, gender, u.c.birth_date, i.c.weight,
+            _weight_class(gender, i.c.weight), _age_category(u.c.birth_date, c.c.start_date),
+            u.c.country_id, u.c.city_id, i.c.rank, p.c.status, a.c.status,
+        )
+        .select_from(p)
+        .join(a, a.c.id == p.c.application_id)
+        .join(c, c.c.id == a.c.competition_id)
+        .join(u, u.c.id == p.c.user_id)
+        .outerjoin(i, i.c.id == u.c.additional_info_id)
+    )
+    team = (
+        sa.select(
+            a.c.competition_id, a.c.id, sa.literal('team'), t.c.id,
+            sa.literal(None, sa.Integer()), a.c.team_id,
+            t.c.last_name, t.c.first_name, t.c.middle_name, no_gender, t.c.birth_date, t.c.weight,
+            _weight_class(no_gender, t.c.weight), _age_category(t.c.birth_date, c.c.start_date),
+            t.c.country_id, t.c.city_id, sa.literal(None, sa.String()), t.c.status, a.c.status,
+        )
+        .select_from(t)
+        .join(a, a.c.id == t.c.application_id)
+        .join(c, c.c.id == a.c.competition_id)
+    )
+    return _roster.insert().from_select(
+        [col.name for col in _roster.c], sa.union_all(individual, team)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_competition_roster_application_id', table_name='competition_roster')
+    op.drop_index('ix_competition_roster_country', table_name='competition_roster')
+    op.drop_index('ix_competition_roster_category', table_name='competition_roster')
+    op.drop_table('competition_roster')
@@ -0,0 +1,32 @@
+"""add roster birth date index
+
+Revision ID: 2c4e8f1a9d35
+Revises: 1b7d3e9a4c20
+Create Date: 2026-10-18 20:14:52.903317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c4e8f1a9d35'
+down_revision: Union[str, None] = '1b7d3e9a4c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_competition_roster_birth_date',
+        'competition_roster',
+        ['competition_id', 'birth_date'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_competition_roster_birth_date', table_name='competition_roster')
@@ -0,0 +1,51 @@
+"""add source member id to team participants
+
+Revision ID: 3d5f9a2b7e41
+Revises: 2c4e8f1a9d35
+Create Date: 2026-10-18 21:07:35.126884
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d5f9a2b7e41'
+down_revision: Union[str, None] = '2c4e8f1a9d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'application_team_participants',
+        sa.Column('source_member_id', sa.Integer(), nullable=True),
+    )
+    op.create_foreign_key(
+        'fk_application_team_participants_source_member_id',
+        'application_team_participants',
+        'team_members',
+        ['source_member_id'],
+        ['id'],
+        ondelete='SET NULL',
+    )
+    op.create_index(
+        'ix_app_team_participants_source_member_id',
+        'application_team_participants',
+        ['source_member_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_app_team_participants_source_member_id', table_name='application_team_participants')
+    op.drop_constraint(
+        'fk_application_team_participants_source_member_id',
+        'application_team_participants',
+        type_='foreignkey',
+    )
+    op.drop_column('application_team_participants', 'source_member_id')
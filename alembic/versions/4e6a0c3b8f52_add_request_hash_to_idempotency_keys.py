@@ -0,0 +1,28 @@
+"""add request hash to idempotency keys
+
+Revision ID: 4e6a0c3b8f52
+Revises: 3d5f9a2b7e41
+Create Date: 2026-10-18 22:14:09.531607
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e6a0c3b8f52'
+down_revision: Union[str, None] = '3d5f9a2b7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('idempotency_keys', sa.Column('request_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'request_hash')
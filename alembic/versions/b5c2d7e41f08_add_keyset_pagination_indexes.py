@@ -0,0 +1,44 @@
+"""add keyset pagination indexes
+
+Revision ID: b5c2d7e41f08
+Revises: 1f3ee0aeea3a
+Create Date: 2026-10-18 10:12:05.114820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c2d7e41f08'
+down_revision: Union[str, None] = '1f3ee0aeea3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, таблица, колонки) — фильтр + сортировка по id для keyset-пагинации
+INDEXES = [
+    ('ix_applications_competition_id_id', 'applications', ['competition_id', 'id']),
+    ('ix_applications_competition_id_status_id', 'applications', ['competition_id', 'status', 'id']),
+    ('ix_app_individual_participants_application_id_id', 'application_individual_participants', ['application_id', 'id']),
+    ('ix_app_team_participants_application_id_id', 'application_team_participants', ['application_id', 'id']),
+    ('ix_matches_competition_id_id', 'matches', ['competition_id', 'id']),
+    ('ix_matches_competition_id_match_time', 'matches', ['competition_id', 'match_time']),
+    ('ix_team_members_team_id_id', 'team_members', ['team_id', 'id']),
+    ('ix_competitions_start_date_id', 'competitions', ['start_date', 'id']),
+    ('ix_venues_city_id_id', 'venues', ['city_id', 'id']),
+    ('ix_cities_country_id_id', 'cities', ['country_id', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,49 @@
+"""add indexes matched to router query shapes
+
+Revision ID: c81e4f0a93d2
+Revises: b5c2d7e41f08
+Create Date: 2026-10-18 11:40:27.508311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81e4f0a93d2'
+down_revision: Union[str, None] = 'b5c2d7e41f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /teams/my-team: Team.coach_id == current_user.id
+    op.create_index('ix_teams_coach_id', 'teams', ['coach_id'])
+    # заявки тренера и команды
+    op.create_index('ix_applications_user_id', 'applications', ['user_id'])
+    op.create_index('ix_applications_team_id', 'applications', ['team_id'])
+    # участие спортсмена в заявках (application_id покрыт индексом (application_id, id))
+    op.create_index(
+        'ix_app_individual_participants_user_id',
+        'application_individual_participants',
+        ['user_id'],
+    )
+    # очередь модерации: только pending-заявки, индекс остаётся маленьким
+    op.create_index(
+        'ix_applications_pending_competition_id',
+        'applications',
+        ['competition_id'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_pending_competition_id', table_name='applications')
+    op.drop_index('ix_app_individual_participants_user_id', table_name='application_individual_participants')
+    op.drop_index('ix_applications_team_id', table_name='applications')
+    op.drop_index('ix_applications_user_id', table_name='applications')
+    op.drop_index('ix_teams_coach_id', table_name='teams')
@@ -0,0 +1,40 @@
+"""add bracket fields to matches
+
+Revision ID: d4a7e2c95b31
+Revises: c81e4f0a93d2
+Create Date: 2026-10-18 14:05:51.360472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7e2c95b31'
+down_revision: Union[str, None] = 'c81e4f0a93d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('matches', sa.Column('category', sa.String(length=100), nullable=True))
+    op.add_column('matches', sa.Column('bracket', sa.String(length=20), nullable=True))
+    op.add_column('matches', sa.Column('round', sa.Integer(), nullable=True))
+    op.add_column('matches', sa.Column('position', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_matches_competition_id_category_round',
+        'matches',
+        ['competition_id', 'category', 'round'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_matches_competition_id_category_round', table_name='matches')
+    op.drop_column('matches', 'position')
+    op.drop_column('matches', 'round')
+    op.drop_column('matches', 'bracket')
+    op.drop_column('matches', 'category')
@@ -0,0 +1,34 @@
+"""add idempotency_keys table
+
+Revision ID: e6f19b3c0d42
+Revises: d4a7e2c95b31
+Create Date: 2026-10-18 15:22:09.871245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f19b3c0d42'
+down_revision: Union[str, None] = 'd4a7e2c95b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('key', sa.String(length=100), nullable=False),
+    sa.Column('scope', sa.String(length=50), nullable=False),
+    sa.Column('resource_ids', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key', 'scope')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('idempotency_keys')
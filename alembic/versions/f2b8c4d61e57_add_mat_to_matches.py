@@ -0,0 +1,28 @@
+"""add mat to matches
+
+Revision ID: f2b8c4d61e57
+Revises: e6f19b3c0d42
+Create Date: 2026-10-18 16:48:33.240918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c4d61e57'
+down_revision: Union[str, None] = 'e6f19b3c0d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('matches', sa.Column('mat', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matches', 'mat')
@@ -0,0 +1,87 @@
+# app/core/auth_cache.py
+"""
+Кэш аутентификации для get_current_user:
+
+* claims — декодированные JWT по sha256 токена (повторный запрос с тем же
+  токеном не проверяет HMAC заново); живут не дольше exp токена;
+* principals — колонки пользователя по login (sub токена), без пароля.
+
+Бэкенд кэша пользователей можно заменить на общий через
+set_user_cache_backend(). Изменение/удаление User через ORM сбрасывает запись.
+"""
+import hashlib
+import time
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from app.core.cache import CacheBackend, TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# Поля, которые не должны попадать в кэш
+_EXCLUDED_COLUMNS = {"password"}
+
+_claims_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CLAIMS_CACHE_TTL_SECONDS,
+)
+_user_cache: CacheBackend = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+def set_user_cache_backend(backend: CacheBackend) -> None:
+    """Подменить хранилище пользователей (например, общим для всех воркеров)."""
+    global _user_cache
+    _user_cache = backend
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_claims(token: str) -> Optional[dict]:
+    return _claims_cache.get(_token_key(token))
+
+
+def put_claims(token: str, payload: dict) -> None:
+    ttl = settings.AUTH_CLAIMS_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl > 0:
+        _claims_cache.set(_token_key(token), payload, ttl)
+
+
+def get_user(login: str) -> Optional[User]:
+    """Возвращает transient-объект User из кэша (без сессии) или None."""
+    data = _user_cache.get(login)
+    if data is None:
+        return None
+    return User(**data)
+
+
+def put_user(user: User) -> None:
+    data = {
+        attr.key: getattr(user, attr.key)
+        for attr in inspect(User).column_attrs
+        if attr.key not in _EXCLUDED_COLUMNS
+    }
+    _user_cache.set(user.login, data)
+
+
+def invalidate_user(login: Optional[str]) -> None:
+    if login is not None:
+        _user_cache.delete(login)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_user(target.login)
+    # при смене логина сбрасываем и старый ключ
+    history = inspect(target).attrs.login.history
+    for old_login in history.deleted or ():
+        invalidate_user(old_login)
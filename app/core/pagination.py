@@ -0,0 +1,66 @@
+# app/core/pagination.py
+
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import Query, Response
+
+from app.core.config import settings
+
+# Заголовок, в котором отдаём курсор следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-After-Id"
+
+
+class KeysetPage:
+    """
+    Параметры keyset-пагинации: after_id (последний id с прошлой страницы)
+    и limit. Используется как зависимость: page: KeysetPage = Depends().
+    """
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(
+            None, ge=0, description="id последней записи предыдущей страницы"
+        ),
+        limit: int = Query(
+            settings.PAGE_DEFAULT_LIMIT,
+            ge=1,
+            le=settings.PAGE_MAX_LIMIT,
+            description="Размер страницы",
+        ),
+    ):
+        self.after_id = after_id
+        self.limit = limit
+
+
+def paginate(query, id_column, page: KeysetPage):
+    """
+    Добавляет к запросу стабильную сортировку по id, условие id > after_id и limit.
+    """
+    if page.after_id is not None:
+        query = query.where(id_column > page.after_id)
+    return query.order_by(id_column).limit(page.limit)
+
+
+def date_range(
+    query,
+    column,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Фильтр по полуинтервалу [date_from, date_to)."""
+    if date_from is not None:
+        query = query.where(column >= date_from)
+    if date_to is not None:
+        query = query.where(column < date_to)
+    return query
+
+
+def set_next_cursor(response: Response, items: Sequence, page: KeysetPage):
+    """
+    Если страница заполнена целиком — отдаём клиенту id, с которого
+    запрашивать следующую страницу.
+    """
+    if len(items) == page.limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1].id)
+    return items
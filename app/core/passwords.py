@@ -0,0 +1,128 @@
+# app/core/passwords.py
+"""
+Хэширование паролей (scrypt из stdlib) на отдельном пуле потоков.
+
+hashlib.scrypt отпускает GIL, поэтому пул потоков даёт реальный
+параллелизм, а event loop не блокируется на ~50–100 мс на каждый логин.
+Число одновременно ожидающих операций ограничено: если очередь полна
+дольше PASSWORD_HASH_QUEUE_TIMEOUT, бросаем PasswordHasherBusy (→ 503).
+
+Формат: scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>.
+Строка без префикса считается старым паролем в открытом виде.
+
+Для неизвестного логина вызывается verify_dummy_password — та же работа
+scrypt над фиктивным хэшем, чтобы время ответа не выдавало, какие логины
+существуют.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple
+
+from app.core.config import settings
+
+PREFIX = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_slots = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+class PasswordHasherBusy(Exception):
+    """Пул хэширования перегружен — запрос стоит повторить позже."""
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=256 * n * r + 1024 * 1024,
+        dklen=KEY_BYTES,
+    )
+
+
+def hash_password_sync(password: str) -> str:
+    n, r, p = settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"{PREFIX}${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(PREFIX + "$")
+
+
+def verify_password_sync(password: str, stored: str) -> Tuple[bool, bool]:
+    """
+    Возвращает (пароль верен, нужно ли перехэшировать).
+    Перехэширование нужно для паролей в открытом виде и устаревших параметров.
+    """
+    if not is_hashed(stored):
+        ok = hmac.compare_digest(password.encode(), stored.encode())
+        return ok, ok
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), n, r, p)
+    except ValueError:
+        return False, False
+
+    ok = hmac.compare_digest(actual, expected)
+    outdated = (n, r, p) != (
+        settings.PASSWORD_SCRYPT_N,
+        settings.PASSWORD_SCRYPT_R,
+        settings.PASSWORD_SCRYPT_P,
+    )
+    return ok, ok and outdated
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password_sync(os.urandom(SALT_BYTES).hex())
+
+
+def _verify_dummy_sync(password: str) -> Tuple[bool, bool]:
+    verify_password_sync(password, _dummy_hash())
+    return False, False
+
+
+async def _run(func, *args):
+    try:
+        await asyncio.wait_for(_slots.acquire(), settings.PASSWORD_HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _slots.release()
+
+
+async def hash_password(password: str) -> str:
+    return await _run(hash_password_sync, password)
+
+
+async def verify_password(password: str, stored: str) -> Tuple[bool, bool]:
+    return await _run(verify_password_sync, password, stored)
+
+
+async def verify_dummy_password(password: str) -> Tuple[bool, bool]:
+    """Проверка против фиктивного хэша: стоит как verify_password, всегда (False, False)."""
+    return await _run(_verify_dummy_sync, password)
@@ -0,0 +1,237 @@
+# app/core/profiling.py
+"""
+Профиль HTTP-запроса: сколько SQL-запросов он выполнил, сколько времени
+провёл в БД, самый медленный запрос и время сериализации ответа.
+
+Составные части:
+  * instrument(engine) — события before/after_cursor_execute движка;
+    каждый запрос замеряется, и если дольше SLOW_QUERY_THRESHOLD_MS,
+    пишется в лог app.sql.slow (для всех запросов, не только выборки);
+  * ProfilingMiddleware — чистый ASGI-middleware: для доли запросов
+    REQUEST_PROFILE_SAMPLE_RATE заводит профиль (contextvar), на старте
+    ответа пишет метрики по маршруту и заголовок Server-Timing;
+  * ProfiledRoute — класс маршрута, отмечающий момент возврата из
+    эндпоинта: всё от него до старта ответа (response_model, рендер
+    JSON) — сериализация. Быстрые списки (fast_list_response)
+    сериализуются внутри эндпоинта и добавляют своё время сами.
+
+Метрики — в /metrics, самые медленные запросы по маршрутам — в
+/metrics/queries. Контекст запроса доходит до событий движка через
+contextvars (greenlet асинхронного SQLAlchemy наследует контекст задачи).
+"""
+import functools
+import inspect
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+slow_logger = logging.getLogger("app.sql.slow")
+
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+STATEMENT_PREVIEW = 1000        # символов SQL в логе и /metrics/queries
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Время до начала ответа (профилируемые запросы)",
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL-запросов на HTTP-запрос",
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Суммарное время SQL-запросов на HTTP-запрос",
+)
+REQUEST_SERIALIZATION_SECONDS = Histogram(
+    "http_request_serialization_seconds",
+    "Время сериализации ответа",
+)
+SLOWEST_QUERY_SECONDS = Gauge(
+    "http_request_slowest_query_seconds",
+    "Самый медленный SQL-запрос маршрута с запуска процесса",
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL-запросов дольше SLOW_QUERY_THRESHOLD_MS",
+)
+
+
+@dataclass
+class RequestProfile:
+    started: float
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    endpoint_done: Optional[float] = None
+
+    def add_query(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"ser;dur={self.serialization_seconds * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
+        )
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+# маршрут -> (секунды, текст) самого медленного запроса
+_slowest: Dict[Tuple[str, str], Tuple[float, str]] = {}
+_slowest_lock = threading.Lock()
+
+
+def current() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def add_serialization(seconds: float):
+    """Учесть сериализацию, выполненную внутри эндпоинта."""
+    profile = _current.get()
+    if profile is not None:
+        profile.serialization_seconds += seconds
+
+
+def slowest_queries() -> Dict[str, dict]:
+    with _slowest_lock:
+        items = sorted(_slowest.items(), key=lambda kv: -kv[1][0])
+    return {
+        f"{method} {route}": {"seconds": round(seconds, 6), "statement": statement}
+        for (method, route), (seconds, statement) in items
+    }
+
+
+# --- движок ---
+
+_STARTED = "query_started"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get(_STARTED)
+    if not stack:
+        return
+    seconds = time.perf_counter() - stack.pop()
+    profile = _current.get()
+    if profile is not None:
+        profile.add_query(statement, seconds)
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and seconds * 1000 >= threshold:
+        SLOW_QUERIES.inc()
+        slow_logger.warning(
+            "медленный запрос %.1f мс%s: %s",
+            seconds * 1000,
+            " (пакет)" if executemany else "",
+            statement[:STATEMENT_PREVIEW],
+        )
+
+
+def _handle_error(exception_context):
+    # упавший запрос не дошёл до after_cursor_execute — снимаем его отметку
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_STARTED):
+        conn.info[_STARTED].pop()
+
+
+def instrument(engine: Engine):
+    """Подключить замеры к синхронному движку (AsyncEngine.sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --- маршруты и middleware ---
+
+def _mark_endpoint_done(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            profile = _current.get()
+            if profile is not None:
+                profile.endpoint_done = time.perf_counter()
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Маршрут, отмечающий в профиле момент возврата из эндпоинта."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "__profiled__", False):
+            endpoint = _mark_endpoint_done(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _record(scope, profile: RequestProfile, now: float):
+    if profile.endpoint_done is not None:
+        profile.serialization_seconds += now - profile.endpoint_done
+    route = getattr(scope.get("route"), "path", None)
+    if route is None:
+        return      # 404 и прочее вне маршрутов
+    labels = {"route": route, "method": scope["method"]}
+    REQUEST_SECONDS.observe(now - profile.started, **labels)
+    REQUEST_QUERIES.observe(profile.queries, **labels)
+    REQUEST_DB_SECONDS.observe(profile.db_seconds, **labels)
+    REQUEST_SERIALIZATION_SECONDS.observe(profile.serialization_seconds, **labels)
+
+    if profile.slowest_statement is None:
+        return
+    key = (scope["method"], route)
+    with _slowest_lock:
+        known = _slowest.get(key)
+        if known is not None and known[0] >= profile.slowest_seconds:
+            return
+        _slowest[key] = (profile.slowest_seconds, profile.slowest_statement[:STATEMENT_PREVIEW])
+    SLOWEST_QUERY_SECONDS.set(profile.slowest_seconds, **labels)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = settings.REQUEST_PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(started=time.perf_counter())
+        token = _current.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                _record(scope, profile, now)
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing(now - profile.started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,152 @@
+# app/core/response_cache.py
+"""
+Кэш ответов GET-эндпоинтов и условные запросы (ETag / If-None-Match).
+
+Эндпоинт помечается декоратором со списком таблиц, из которых
+собирается ответ:
+
+    @router.get("/", response_model=List[CompetitionRead])
+    @cached("competitions", "venues", "cities")
+    async def get_all_competitions(...):
+
+Роутер должен использовать класс маршрута CachedRoute
+(APIRouter(..., route_class=CachedRoute)). Запись кэша действительна,
+пока не изменились путь, параметры запроса и счётчики изменений этих
+таблиц (app/db/changes.py), поэтому маршрут отвечает 304 или отдаёт
+сохранённое тело ещё до разрешения зависимостей и вызова эндпоинта —
+без сессии и ORM. Commit, затронувший любую из таблиц, меняет счётчики,
+и старая запись перестаёт совпадать (и со временем вытесняется LRU). Кэш ограничен
+числом записей и суммарным размером тел; ответы больше
+RESPONSE_CACHE_MAX_ENTRY_BYTES не сохраняются.
+
+Изменения, сделанные другим воркером, счётчики этого процесса не
+видят, поэтому 304 отдаётся только при живой записи кэша: после
+RESPONSE_CACHE_TTL_SECONDS запись истекает и ответ строится заново из
+БД. ETag включает хэш тела, так что новое тело — это и новый ETag.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+from app.core.profiling import ProfiledRoute
+from app.db import changes
+
+CACHE_CONTROL = "no-cache"     # клиент может хранить ответ, но обязан перепроверить ETag
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    tables: Tuple[str, ...]
+    vary: Tuple[str, ...] = ()      # заголовки запроса, от которых зависит ответ
+
+
+@dataclass
+class CachedResponse:
+    state: str          # счётчики таблиц на момент сохранения
+    etag: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+_cache = TTLCache(
+    max_size=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry.body),
+)
+
+REQUESTS = Counter("response_cache_requests_total", "Запросы к кэшируемым эндпоинтам по результату")
+CACHE_BYTES = Gauge("response_cache_bytes", "Размер тел в кэше ответов", callback=lambda: _cache.bytes)
+
+
+def cached(*tables: str, vary: Tuple[str, ...] = ()):
+    """Помечает GET-эндпоинт как кэшируемый; tables — таблицы, от которых зависит ответ."""
+    policy = CachePolicy(tuple(sorted(tables)), tuple(h.lower() for h in vary))
+
+    def decorator(endpoint):
+        endpoint.__response_cache__ = policy
+        return endpoint
+
+    return decorator
+
+
+def clear():
+    _cache.clear()
+
+
+def _request_key(request: Request, policy: CachePolicy) -> str:
+    query = sorted(request.query_params.multi_items())
+    varied = [request.headers.get(h, "") for h in policy.vary]
+    return repr((request.url.path, query, varied))
+
+
+def _state(key: str, policy: CachePolicy) -> str:
+    return repr((key, changes.EPOCH, changes.versions(policy.tables)))
+
+
+def _etag(state: str, body: bytes) -> str:
+    digest = hashlib.blake2b(state.encode(), digest_size=12)
+    digest.update(body)
+    return '"%s"' % digest.hexdigest()
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match совпадает с etag: список через запятую, W/ игнорируется, * — любой."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class CachedRoute(ProfiledRoute):
+    """Маршрут, который для эндпоинтов с @cached отвечает 304 / из кэша."""
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        handler = super().get_route_handler()
+        policy: Optional[CachePolicy] = getattr(self.endpoint, "__response_cache__", None)
+        if policy is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+            key = _request_key(request, policy)
+            state = _state(key, policy)
+
+            # 304 — только при живой записи: счётчики не видят изменений
+            # других воркеров, а запись истекает по TTL
+            entry = _cache.get(key)
+            if entry is not None and entry.state == state:
+                if not_modified(request, entry.etag):
+                    REQUESTS.inc(result="not_modified")
+                    return Response(
+                        status_code=304,
+                        headers={"ETag": entry.etag, "Cache-Control": CACHE_CONTROL},
+                    )
+                REQUESTS.inc(result="hit")
+                return Response(content=entry.body, status_code=entry.status, headers=entry.headers)
+
+            REQUESTS.inc(result="miss")
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code == 200 and body is not None:
+                etag = _etag(state, body)
+                response.headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+                if len(body) <= settings.RESPONSE_CACHE_MAX_ENTRY_BYTES:
+                    _cache.set(key, CachedResponse(
+                        state=state,
+                        etag=etag,
+                        status=response.status_code,
+                        headers=dict(response.headers),
+                        body=body,
+                    ))
+            return response
+
+        return cached_handler
@@ -0,0 +1,39 @@
+# app/core/responses.py
+"""
+Ответ-список через быстрый сериализатор (app/schemas/fast.py).
+
+    return fast_list_response(response, ApplicationRead, items)
+
+response_model у эндпоинта остаётся — для OpenAPI и как эталон формы;
+Response, возвращённый из эндпоинта, FastAPI не валидирует. Заголовки,
+выставленные на внедрённом response (курсор пагинации), переносятся.
+FAST_JSON_RESPONSES=false возвращает обычный путь через pydantic.
+"""
+import time
+from typing import Any, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core import profiling
+from app.core.config import settings
+from app.schemas.fast import dumps, serialize_many
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_list_response(response: Response, schema: Type[BaseModel], items: Sequence[Any]):
+    if not settings.FAST_JSON_RESPONSES:
+        return items
+    started = time.perf_counter()
+    fast = FastJSONResponse(
+        serialize_many(schema, items),
+        headers={k: v for k, v in response.headers.items() if k != "content-length"},
+    )
+    profiling.add_serialization(time.perf_counter() - started)
+    return fast
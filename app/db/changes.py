@@ -0,0 +1,76 @@
+# app/db/changes.py
+"""
+Счётчики изменений по таблицам.
+
+Каждый успешный commit сессии увеличивает счётчик всех таблиц, которые
+он затронул: ORM-объекты (flush) и DML-выражения через session.execute
+(insert / update / delete, в том числе пакетные). По набору счётчиков
+можно понять, изменились ли данные ответа, не обращаясь к БД, — на этом
+построены ETag кэша ответов (app/core/response_cache.py).
+
+Счётчики живут в памяти процесса; EPOCH отличает их от счётчиков
+другого процесса или предыдущего запуска. Изменения в обход приложения
+(psql, другой воркер) здесь не видны — для этого у кэшей есть TTL.
+"""
+import threading
+import uuid
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+EPOCH = uuid.uuid4().hex[:8]
+
+_versions: Dict[str, int] = {}
+_lock = threading.Lock()
+
+_PENDING = "changed_tables"
+
+
+def version(table: str) -> int:
+    return _versions.get(table, 0)
+
+
+def versions(tables: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(_versions.get(t, 0) for t in tables)
+
+
+def bump(*tables: str):
+    """Отметить изменение вручную (например, после правки в обход сессии)."""
+    with _lock:
+        for t in tables:
+            _versions[t] = _versions.get(t, 0) + 1
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session, flush_context):
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            pending.add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        name = getattr(table, "name", None)
+        if name is not None:
+            _pending(orm_execute_state.session).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish(session):
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        bump(*pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop(_PENDING, None)
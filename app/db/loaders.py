@@ -0,0 +1,73 @@
+# app/db/loaders.py
+"""
+Опции загрузки для заявок: какие колонки и связи нужны конкретной схеме ответа.
+
+Связи в моделях не грузятся жадно по умолчанию — каждый эндпоинт явно
+передаёт опции. raiseload("*") на конце гарантирует, что случайное
+обращение к незагруженной связи упадёт сразу, а не даст лишний запрос.
+
+    select(Application).options(*application_read_options())
+"""
+from sqlalchemy.orm import load_only, raiseload, selectinload
+
+from app.models.application import Application, ApplicationIndividualParticipant
+from app.models.user import User
+
+# Колонки, которые читает UserRead
+USER_READ_COLUMNS = (
+    User.id,
+    User.first_name,
+    User.last_name,
+    User.middle_name,
+    User.login,
+    User.phone,
+    User.email,
+    User.organization,
+    User.role_id,
+    User.city_id,
+    User.country_id,
+)
+
+# Колонки, которые читает ApplicationRead
+APPLICATION_READ_COLUMNS = (
+    Application.id,
+    Application.competition_id,
+    Application.request_type_id,
+    Application.team_id,
+    Application.user_id,
+    Application.request_date,
+    Application.status,
+)
+
+INDIVIDUAL_PARTICIPANT_READ_COLUMNS = (
+    ApplicationIndividualParticipant.id,
+    ApplicationIndividualParticipant.application_id,
+    ApplicationIndividualParticipant.user_id,
+    ApplicationIndividualParticipant.status,
+)
+
+
+def _user():
+    return load_only(*USER_READ_COLUMNS), raiseload("*")
+
+
+def individual_participant_options():
+    """ApplicationIndividualParticipantRead: участник + пользователь."""
+    return (
+        load_only(*INDIVIDUAL_PARTICIPANT_READ_COLUMNS),
+        selectinload(ApplicationIndividualParticipant.user).options(*_user()),
+        raiseload("*"),
+    )
+
+
+def application_read_options():
+    """Всё, что нужно ApplicationRead (список и одна заявка)."""
+    return (
+        load_only(*APPLICATION_READ_COLUMNS),
+        selectinload(Application.user).options(*_user()),
+        selectinload(Application.individual_participants).options(
+            *individual_participant_options()
+        ),
+        selectinload(Application.team_participants).options(raiseload("*")),
+        raiseload("*"),
+    )
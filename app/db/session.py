@@ -1,6 +1,76 @@
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import profiling
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Время ожидания соединения из пула",
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Соединений, выданных из пула в данный момент",
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Пул, который замеряет время ожидания свободного соединения."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
+def _engine_options() -> dict:
+    options = {"echo": settings.SQL_ECHO}
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # для smoke-прогонов на SQLite оставляем пул по умолчанию
+        return options
+
+    options.update(
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DATABASE_URL.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            },
+        }
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **_engine_options())
+AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+profiling.instrument(engine.sync_engine)
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_IN_USE.inc()
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    POOL_IN_USE.dec()
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
-AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
\ No newline at end of file
+async def get_db():
+    """Общая зависимость FastAPI: одна сессия на запрос."""
+    async with AsyncSessionLocal() as session:
+        yield session
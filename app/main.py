@@ -5,7 +5,10 @@ from app.routers import users, teams, competitions, applications, matches, auth
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app import models  # 👈 импорт всех моделей (ВАЖНО!)
-from app.routers import additional_info, location
+from app.routers import additional_info, location, metrics
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.profiling import ProfilingMiddleware
+from app.services.dedup import DUPLICATES_HEADER
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -16,15 +19,18 @@ app = FastAPI(
 # === CORS ===
 # Используем ALLOWED_ORIGINS из .env или вручную подставляем fallback
 
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:8080"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing", DUPLICATES_HEADER],
 )
 
+# === Профилирование запросов (SQL, сериализация; доля — REQUEST_PROFILE_SAMPLE_RATE) ===
+app.add_middleware(ProfilingMiddleware)
+
 # === Подключение роутеров ===
 app.include_router(users.router)
 app.include_router(teams.router)
@@ -34,3 +40,4 @@ app.include_router(matches.router)
 app.include_router(auth.router)
 app.include_router(additional_info.router)
 app.include_router(location.router)
+app.include_router(metrics.router)
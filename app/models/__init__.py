@@ -3,3 +3,5 @@ from .team import Team, TeamMember
 from .application import Application, RequestType, ApplicationTeamParticipant, ApplicationIndividualParticipant
 from .competition import Competition, Venue
 from .match import Match
+from .idempotency import IdempotencyKey
+from .roster import RosterEntry
@@ -6,6 +6,8 @@ from sqlalchemy import (
     String,
     ForeignKey,
     DateTime,
+    Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -20,6 +22,19 @@ class RequestType(Base):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_competition_id_id", "competition_id", "id"),
+        Index("ix_applications_competition_id_status_id", "competition_id", "status", "id"),
+        Index("ix_applications_user_id", "user_id"),
+        Index("ix_applications_team_id", "team_id"),
+        # очередь модерации: pending-заявки по соревнованию
+        Index(
+            "ix_applications_pending_competition_id",
+            "competition_id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
 
     id            = Column(Integer, primary_key=True)
     request_date  = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -49,15 +64,11 @@ class Application(Base):
         default="pending"          # в SQLAlchemy-объекте
     )
 
-    # связи
-    competition = relationship(
-        "Competition",
-        back_populates="applications",
-        lazy="joined"
-    )
-    request_type = relationship("RequestType", lazy="joined")
-    team         = relationship("Team", lazy="joined")
-    user         = relationship("User", lazy="joined")
+    # связи (грузятся явно через опции из app/db/loaders.py)
+    competition = relationship("Competition", back_populates="applications")
+    request_type = relationship("RequestType")
+    team         = relationship("Team")
+    user         = relationship("User")
 
     individual_participants = relationship(
         "ApplicationIndividualParticipant",
@@ -73,6 +84,10 @@ class Application(Base):
 
 class ApplicationIndividualParticipant(Base):
     __tablename__ = "application_individual_participants"
+    __table_args__ = (
+        Index("ix_app_individual_participants_application_id_id", "application_id", "id"),
+        Index("ix_app_individual_participants_user_id", "user_id"),
+    )
 
     id             = Column(Integer, primary_key=True)
     application_id = Column(
@@ -96,13 +111,16 @@ class ApplicationIndividualParticipant(Base):
     application = relationship(
         "Application",
         back_populates="individual_participants",
-        lazy="joined",
     )
-    user = relationship("User", lazy="joined")
+    user = relationship("User")
 
 
 class ApplicationTeamParticipant(Base):
     __tablename__ = "application_team_participants"
+    __table_args__ = (
+        Index("ix_app_team_participants_application_id_id", "application_id", "id"),
+        Index("ix_app_team_participants_source_member_id", "source_member_id"),
+    )
 
     id             = Column(Integer, primary_key=True)
     application_id = Column(
@@ -125,9 +143,14 @@ class ApplicationTeamParticipant(Base):
         server_default="pending",
         default="pending"
     )
+    # член команды, из которого скопирован участник (заявка «с командой»)
+    source_member_id = Column(
+        Integer,
+        ForeignKey("team_members.id", ondelete="SET NULL"),
+        nullable=True
+    )
 
     application = relationship(
         "Application",
         back_populates="team_participants",
-        lazy="joined",
     )
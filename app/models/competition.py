@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Venue(Base):
     __tablename__ = "venues"
+    __table_args__ = (
+        Index("ix_venues_city_id_id", "city_id", "id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     city_id = Column(Integer, ForeignKey("cities.id"))
@@ -12,6 +15,9 @@ class Venue(Base):
 
 class Competition(Base):
     __tablename__ = "competitions"
+    __table_args__ = (
+        Index("ix_competitions_start_date_id", "start_date", "id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     organizer = Column(String)
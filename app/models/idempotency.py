@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String, Text
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Результат уже выполненного запроса с заголовком Idempotency-Key:
+    повтор с тем же ключом возвращает прежний результат, а не создаёт дубликаты.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(100), primary_key=True)
+    scope = Column(String(50), primary_key=True)     # например, "matches.batch"
+    resource_ids = Column(Text, nullable=False)      # JSON-список id созданных объектов
+    request_hash = Column(String(64), nullable=True) # хэш тела запроса: тот же ключ с другим телом — ошибка
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        Index("ix_matches_competition_id_id", "competition_id", "id"),
+        Index("ix_matches_competition_id_match_time", "competition_id", "match_time"),
+        Index("ix_matches_competition_id_category_round", "competition_id", "category", "round"),
+    )
     id = Column(Integer, primary_key=True)
 
     red_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
@@ -17,6 +22,17 @@ class Match(Base):
     referee_id = Column(Integer, ForeignKey("users.id"))
     judge_id = Column(Integer, ForeignKey("users.id"))
 
+    # место в сетке (заполняется генератором сеток, см. app/services/brackets.py)
+    category = Column(String(100), nullable=True)
+    bracket = Column(String(20), nullable=True)
+    round = Column(Integer, nullable=True)
+    position = Column(Integer, nullable=True)
+
+    mat = Column(Integer, nullable=True)    # номер татами
+
+    # версия для оптимистичной блокировки (compare-and-swap в PATCH /matches/{id})
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     red = relationship("User", foreign_keys=[red_id])
     blue = relationship("User", foreign_keys=[blue_id])
     winner = relationship("User", foreign_keys=[winner_id])
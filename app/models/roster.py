@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, UniqueConstraint
+from app.db.base import Base
+
+
+class RosterEntry(Base):
+    """
+    Стартовый список соревнования: одна нормализованная строка на
+    участника заявки — индивидуального (данные из users / additional_info)
+    или командного (данные из самой заявки). Весовая и возрастная
+    категории посчитаны заранее, как в сетках. Таблица ведётся
+    app/services/roster.py в тех же транзакциях, что меняют заявки.
+    """
+    __tablename__ = "competition_roster"
+    __table_args__ = (
+        UniqueConstraint("source", "participant_id", name="uq_competition_roster_source_participant"),
+        # жеребьёвка: категория соревнования, по фамилии
+        Index(
+            "ix_competition_roster_category",
+            "competition_id", "weight_class", "age_category", "last_name",
+        ),
+        Index("ix_competition_roster_country", "competition_id", "country_id"),
+        Index("ix_competition_roster_application_id", "application_id"),
+        # поиск дублей: блоки по дате рождения (app/services/dedup.py)
+        Index("ix_competition_roster_birth_date", "competition_id", "birth_date"),
+    )
+
+    id             = Column(Integer, primary_key=True)
+    competition_id = Column(Integer, ForeignKey("competitions.id", ondelete="CASCADE"), nullable=False)
+    application_id = Column(Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
+    source         = Column(String(10), nullable=False)     # individual / team
+    participant_id = Column(Integer, nullable=False)        # id в таблице участников source
+    user_id        = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    team_id        = Column(Integer, nullable=True)
+
+    last_name    = Column(String(100))
+    first_name   = Column(String(100))
+    middle_name  = Column(String(100))
+    gender       = Column(String(1))        # M / F; NULL — не указан
+    birth_date   = Column(Date)
+    weight       = Column(Integer)
+    weight_class = Column(String(10), nullable=False)   # "-73", "+100", "open"
+    age_category = Column(String(10), nullable=False)   # U15 / U18 / U21 / Senior
+    country_id   = Column(Integer)
+    city_id      = Column(Integer)
+    rank         = Column(String)
+
+    status             = Column(String(20), nullable=False)   # статус участника
+    application_status = Column(String(20), nullable=False)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Team(Base):
     __tablename__ = "teams"
+    __table_args__ = (
+        Index("ix_teams_coach_id", "coach_id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     coach_id = Column(Integer, ForeignKey("users.id"))
@@ -13,6 +16,9 @@ class Team(Base):
 
 class TeamMember(Base):
     __tablename__ = "team_members"
+    __table_args__ = (
+        Index("ix_team_members_team_id_id", "team_id", "id"),
+    )
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("teams.id"))
 
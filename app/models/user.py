@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -14,6 +14,9 @@ class Country(Base):
 
 class City(Base):
     __tablename__ = "cities"
+    __table_args__ = (
+        Index("ix_cities_country_id_id", "country_id", "id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     country_id = Column(Integer, ForeignKey("countries.id"))
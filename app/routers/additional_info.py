@@ -1,22 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
+from app.core.pagination import KeysetPage, paginate, set_next_cursor
+from app.core.profiling import ProfiledRoute
 from app.models.user import AdditionalInfo
 from app.schemas.user import AdditionalInfoCreate, AdditionalInfoRead
 
-router = APIRouter(prefix="/additional-info", tags=["AdditionalInfo"])
+router = APIRouter(prefix="/additional-info", tags=["AdditionalInfo"], route_class=ProfiledRoute)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 @router.post("/", response_model=AdditionalInfoRead)
 async def create_additional_info(
     additional_info: AdditionalInfoCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    new_info = AdditionalInfo(**additional_info.dict())
+    new_info = AdditionalInfo(**additional_info.model_dump())
     db.add(new_info)
     await db.commit()
     await db.refresh(new_info)
@@ -31,7 +30,11 @@ async def get_additional_info(info_id: int, db: AsyncSession = Depends(get_db)):
     return info
 
 @router.get("/", response_model=list[AdditionalInfoRead])
-async def get_all_additional_infos(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(AdditionalInfo))
+async def get_all_additional_infos(
+    response: Response,
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(paginate(select(AdditionalInfo), AdditionalInfo.id, page))
     infos = result.scalars().all()
-    return infos
+    return set_next_cursor(response, infos, page)
@@ -1,12 +1,18 @@
 # app/routers/applications.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, List, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
+from app.db.loaders import application_read_options, individual_participant_options
+from app.core.config import settings
+from app.core.pagination import KeysetPage, paginate, date_range, set_next_cursor
+from app.core.response_cache import CachedRoute, cached
+from app.core.responses import fast_list_response
 from app.models.application import (
     Application,
     RequestType,
@@ -24,99 +30,148 @@ from app.schemas.application import (
     ApplicationIndividualParticipantCreate,
     ApplicationIndividualParticipantRead,
     ApplicationUpdate,
+    ApplicationBulkError,
+    ApplicationBulkResult,
+    ApplicationStatusBulk,
+    ApplicationStatusBulkResult,
+)
+from app.services import dedup, reference, roster, standings
+from app.services.export import EXPORTERS, MEDIA_TYPES
+from app.services.applications import (
+    change_status,
+    insert_applications,
+    parse_items,
+    validate_references,
 )
 from app.routers.auth import get_current_user
 from app.schemas.user import UserRead
 
-router = APIRouter(prefix="/applications", tags=["Applications"])
-
-
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+router = APIRouter(prefix="/applications", tags=["Applications"], route_class=CachedRoute)
 
 
 @router.post("/", response_model=ApplicationRead)
 async def create_application(
     application: ApplicationCreate,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Создаёт новую заявку (pending), добавляет участников и возвращает её
     с полными связями (user, individual_participants, team_participants).
+    Ответ собирается из INSERT ... RETURNING, без повторного select.
     """
-    new_application = Application(
-        competition_id=application.competition_id,
-        request_type_id=application.request_type_id,
-        team_id=application.team_id,
-        request_date=application.request_date,
-        user_id=current_user.id,
-        status="pending",
-    )
-    db.add(new_application)
-    await db.flush()
-
-    if application.team_participants:
-        for p in application.team_participants:
-            data = p.dict(exclude={"application_id"})
-            db.add(
-                ApplicationTeamParticipant(
-                    application_id=new_application.id, **data
-                )
-            )
-
-    if application.individual_participants:
-        for p in application.individual_participants:
-            data = p.dict(exclude={"application_id"})
-            db.add(
-                ApplicationIndividualParticipant(
-                    application_id=new_application.id, **data
-                )
-            )
+    errors, users = await validate_references(db, {0: application})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors[0])
 
+    created = await insert_applications(db, [application], current_user, users)
+    duplicates = await dedup.check_applications(db, [created[0].id])
     await db.commit()
+    if duplicates:
+        # подробности — GET /competitions/{id}/duplicates?application_id=...
+        response.headers[dedup.DUPLICATES_HEADER] = str(len(duplicates))
+    return created[0]
 
-    # Eager-загружаем связи, чтобы Pydantic не пытался делать асинхронные lazy-operation
-    q = (
-        select(Application)
-        .where(Application.id == new_application.id)
-        .options(
-            selectinload(Application.user),
-            selectinload(Application.individual_participants)
-                .selectinload(ApplicationIndividualParticipant.user),
-            selectinload(Application.team_participants),
+
+@router.post(
+    "/bulk",
+    response_model=ApplicationBulkResult,
+    summary="Массовая подача заявок",
+)
+async def create_applications_bulk(
+    items: List[Any] = Body(..., description="Список ApplicationCreate"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Принимает много заявок за один вызов. Каждая заявка валидируется отдельно:
+    корректные создаются одной транзакцией, по остальным возвращаются ошибки
+    с индексом во входном списке.
+    """
+    if len(items) > settings.APPLICATION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не больше {settings.APPLICATION_BULK_MAX_ITEMS} заявок за запрос",
         )
+
+    parsed, errors = parse_items(items)
+    ref_errors, users = await validate_references(db, parsed)
+    errors.update(ref_errors)
+
+    valid = [parsed[i] for i in sorted(parsed) if i not in errors]
+    created = await insert_applications(db, valid, current_user, users)
+    duplicates = await dedup.check_applications(db, [a.id for a in created])
+    await db.commit()
+
+    return ApplicationBulkResult(
+        created=created,
+        possible_duplicates=duplicates,
+        errors=[
+            ApplicationBulkError(index=i, errors=errors[i]) for i in sorted(errors)
+        ],
     )
-    result = await db.execute(q)
-    created = result.scalars().first()
-    return created
 
 
 @router.get("/", response_model=List[ApplicationRead])
+@cached(
+    "applications",
+    "application_individual_participants",
+    "application_team_participants",
+    "users",
+)
 async def get_all_applications(
+    response: Response,
     competition_id: Optional[int] = None,
+    status: Optional[str] = Query(None, description="Статус заявки"),
+    team_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, description="request_date >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="request_date < date_to"),
+    page: KeysetPage = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Возвращает список заявок. Если передан competition_id, то только для него.
-    Включает user, individual_participants, team_participants и команду.
+    Возвращает страницу заявок (keyset по id) с фильтрами по соревнованию,
+    статусу, команде, тренеру и дате подачи.
+    Включает user, individual_participants и team_participants (application_read_options()).
     """
-    q = (
-        select(Application)
-        .options(
-            selectinload(Application.individual_participants)
-                .selectinload(ApplicationIndividualParticipant.user),
-            selectinload(Application.team_participants),
-            selectinload(Application.team),
-            selectinload(Application.user),
-        )
-    )
+    q = select(Application).options(*application_read_options())
     if competition_id is not None:
         q = q.where(Application.competition_id == competition_id)
+    if status is not None:
+        q = q.where(Application.status == status)
+    if team_id is not None:
+        q = q.where(Application.team_id == team_id)
+    if user_id is not None:
+        q = q.where(Application.user_id == user_id)
+    q = date_range(q, Application.request_date, date_from, date_to)
+    q = paginate(q, Application.id, page)
 
     result = await db.execute(q)
-    return result.scalars().all()
+    applications = set_next_cursor(response, result.scalars().all(), page)
+    return fast_list_response(response, ApplicationRead, applications)
+
+
+@router.get(
+    "/export",
+    summary="Потоковая выгрузка участников соревнования (NDJSON / CSV)",
+)
+async def export_applications(
+    competition_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """
+    Выгружает всех участников заявок соревнования: одна строка на участника
+    с данными заявки. Данные читаются серверным курсором и пишутся в ответ
+    по мере чтения, поэтому объём выгрузки не влияет на память воркера.
+    """
+    filename = f"competition-{competition_id}-participants.{format}"
+    return StreamingResponse(
+        EXPORTERS[format](competition_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # --- CRUD для участников заявки ---
@@ -129,11 +184,19 @@ async def add_individual_participant(
     participant: ApplicationIndividualParticipantCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    new = ApplicationIndividualParticipant(**participant.dict())
+    new = ApplicationIndividualParticipant(**participant.model_dump())
     db.add(new)
+    await db.flush()
+    await roster.refresh_applications(db, [new.application_id])
     await db.commit()
-    await db.refresh(new)
-    return new
+
+    result = await db.execute(
+        select(ApplicationIndividualParticipant)
+        .where(ApplicationIndividualParticipant.id == new.id)
+        .options(*individual_participant_options())
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
 
 
 @router.get(
@@ -141,10 +204,25 @@ async def add_individual_participant(
     response_model=List[ApplicationIndividualParticipantRead],
 )
 async def get_all_individual_participants(
+    response: Response,
+    application_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    page: KeysetPage = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(ApplicationIndividualParticipant))
-    return result.scalars().all()
+    q = select(ApplicationIndividualParticipant).options(*individual_participant_options())
+    if application_id is not None:
+        q = q.where(ApplicationIndividualParticipant.application_id == application_id)
+    if user_id is not None:
+        q = q.where(ApplicationIndividualParticipant.user_id == user_id)
+    if status is not None:
+        q = q.where(ApplicationIndividualParticipant.status == status)
+    q = paginate(q, ApplicationIndividualParticipant.id, page)
+
+    result = await db.execute(q)
+    participants = set_next_cursor(response, result.scalars().all(), page)
+    return fast_list_response(response, ApplicationIndividualParticipantRead, participants)
 
 
 @router.post(
@@ -155,8 +233,10 @@ async def add_team_participant(
     participant: ApplicationTeamParticipantCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    new = ApplicationTeamParticipant(**participant.dict())
+    new = ApplicationTeamParticipant(**participant.model_dump())
     db.add(new)
+    await db.flush()
+    await roster.refresh_applications(db, [new.application_id])
     await db.commit()
     await db.refresh(new)
     return new
@@ -166,9 +246,24 @@ async def add_team_participant(
     "/participants/team/",
     response_model=List[ApplicationTeamParticipantRead],
 )
-async def get_all_team_participants(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(ApplicationTeamParticipant))
-    return result.scalars().all()
+async def get_all_team_participants(
+    response: Response,
+    application_id: Optional[int] = None,
+    status: Optional[str] = None,
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    # строки колонок (Row) без ORM-объектов — сразу в быстрый сериализатор
+    q = select(*ApplicationTeamParticipant.__table__.c)
+    if application_id is not None:
+        q = q.where(ApplicationTeamParticipant.application_id == application_id)
+    if status is not None:
+        q = q.where(ApplicationTeamParticipant.status == status)
+    q = paginate(q, ApplicationTeamParticipant.id, page)
+
+    result = await db.execute(q)
+    rows = set_next_cursor(response, result.all(), page)
+    return fast_list_response(response, ApplicationTeamParticipantRead, rows)
 
 
 # --- Типы заявок ---
@@ -181,10 +276,11 @@ async def create_request_type(
     request_type: RequestTypeCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    new = RequestType(**request_type.dict())
+    new = RequestType(**request_type.model_dump())
     db.add(new)
     await db.commit()
     await db.refresh(new)
+    reference.invalidate("request_types")
     return new
 
 
@@ -192,15 +288,45 @@ async def create_request_type(
     "/request-types/",
     response_model=List[RequestTypeRead],
 )
-async def get_request_types(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(RequestType))
-    return result.scalars().all()
+async def get_request_types(
+    request: Request,
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    return await reference.respond(request, db, "request_types", page)
+
+
+@router.post(
+    "/status",
+    response_model=ApplicationStatusBulkResult,
+    summary="Массовая смена статуса заявок",
+)
+async def update_applications_status(
+    params: ApplicationStatusBulk,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Переводит заявки в новый статус одним UPDATE вместе с их участниками.
+    Запрещённые переходы и несуществующие заявки не прерывают операцию —
+    они перечислены в rejected.
+    """
+    if len(params.ids) > settings.APPLICATION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Не больше {settings.APPLICATION_BULK_MAX_ITEMS} заявок за запрос",
+        )
+
+    report, competitions = await change_status(db, params.ids, params.status)
+    await db.commit()
+    for competition_id in competitions:
+        standings.invalidate(competition_id)
+    return report
 
 
 @router.patch(
     "/{app_id}",
     response_model=ApplicationRead,
-    summary="Частичное обновление заявки (обычно — смена статуса)",
+    summary="Смена статуса заявки",
 )
 async def update_application(
     app_id: int,
@@ -208,28 +334,28 @@ async def update_application(
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Меняет поля заявки (например, статус), коммитит и
-    возвращает её заново с полными связями.
+    Меняет статус заявки и её участников (те же переходы, что и у
+    POST /applications/status), коммитит и возвращает заявку заново
+    с полными связями.
     """
-    db_app = await db.get(Application, app_id)
-    if not db_app:
-        raise HTTPException(status_code=404, detail="Заявка не найдена")
-
-    for field, value in app_upd.dict(exclude_unset=True).items():
-        setattr(db_app, field, value)
+    report, competitions = await change_status(db, [app_id], app_upd.status)
+    if report.rejected:
+        rejected = report.rejected[0]
+        raise HTTPException(
+            status_code=404 if rejected.status is None else 409,
+            detail=rejected.reason,
+        )
 
-    db.add(db_app)
     await db.commit()
+    for competition_id in competitions:
+        standings.invalidate(competition_id)
 
     # Перезапрос с eager-загрузкой связей
     q = (
         select(Application)
         .where(Application.id == app_id)
-        .options(
-            selectinload(Application.user),
-            selectinload(Application.individual_participants),
-            selectinload(Application.team_participants),
-        )
+        .options(*application_read_options())
+        .execution_options(populate_existing=True)
     )
     result = await db.execute(q)
     updated_app = result.scalars().first()
@@ -1,15 +1,26 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import Token, TokenData, UserLogin
 from app.core.config import settings
+from app.core import auth_cache
+from app.core.profiling import ProfiledRoute
+from app.core.passwords import (
+    PasswordHasherBusy,
+    hash_password,
+    verify_dummy_password,
+    verify_password,
+)
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=ProfiledRoute)
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
@@ -17,9 +28,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -32,29 +40,46 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
-    print("▶ Попытка входа:", form_data.username)
+    login = form_data.username
+    result = await db.execute(select(User).where(User.login == login))
+    user = result.scalar_one_or_none()
 
+    known = user is not None and bool(user.password)
     try:
-        result = await db.execute(select(User).where(User.login == form_data.username))
-        user = result.scalar_one_or_none()
-        print("▶ Пользователь найден:", user)
+        if known:
+            ok, needs_rehash = await verify_password(form_data.password, user.password)
+        else:
+            # неизвестный логин платит тот же scrypt — время ответа не выдаёт логины
+            ok, needs_rehash = await verify_dummy_password(form_data.password)
+    except PasswordHasherBusy:
+        logger.warning("login rejected: password hasher busy", extra={"login": login})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service busy, retry later",
+            headers={"Retry-After": "1"},
+        )
 
-        if not user or not user.password:
-            print("⛔ Пользователь не найден или пустой пароль")
-            raise HTTPException(status_code=400, detail="Incorrect username or password")
+    if not known:
+        logger.info("login failed", extra={"login": login, "reason": "unknown_user"})
+        raise HTTPException(status_code=400, detail="Incorrect username or password")
+    if not ok:
+        logger.info("login failed", extra={"login": login, "reason": "bad_password"})
+        raise HTTPException(status_code=400, detail="Incorrect username or password")
 
-        if user.password != form_data.password:
-            print("⛔ Пароль не совпадает")
-            raise HTTPException(status_code=400, detail="Incorrect username or password")
+    # прозрачная миграция: открытый пароль / старые параметры -> актуальный scrypt
+    if needs_rehash:
+        try:
+            user.password = await hash_password(form_data.password)
+            await db.commit()
+            logger.info("password rehashed", extra={"login": login, "user_id": user.id})
+        except PasswordHasherBusy:
+            logger.warning("password rehash postponed", extra={"login": login})
 
-        access_token = create_access_token(data={"sub": user.login})
-        print("✅ Токен успешно создан:", access_token)
+    access_token = create_access_token(data={"sub": user.login})
+    logger.info("login succeeded", extra={"login": login, "user_id": user.id})
 
-        return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "token_type": "bearer"}
 
-    except Exception as e:
-        print("💥 ВНУТРЕННЯЯ ОШИБКА:", e)
-        raise HTTPException(status_code=500, detail="Internal Server Error")
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
@@ -63,15 +88,25 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    payload = auth_cache.get_claims(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
             raise credentials_exception
-    except JWTError:
+        auth_cache.put_claims(token, payload)
+    username: str = payload.get("sub")
+    if username is None:
         raise credentials_exception
+
+    # горячий путь: пользователь уже в кэше — в БД не ходим
+    user = auth_cache.get_user(username)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.login == username))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    auth_cache.put_user(user)
     return user
@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
+from app.core.pagination import KeysetPage, paginate, date_range, set_next_cursor
+from app.core.response_cache import CachedRoute, cached
+from app.core.responses import fast_list_response
 from app.models.competition import Competition, Venue
 from app.schemas.competition import CompetitionCreate, CompetitionRead, VenueCreate, VenueRead
+from app.schemas.aggregates import CompetitionAggregates
+from app.schemas.duplicates import DuplicateReport
+from app.schemas.roster import RosterEntryRead, RosterRebuildResult
+from app.schemas.standings import MedalRow, StandingsRead, StandingsRebuildResult
+from app.services import aggregates, dedup, reference, roster, standings
+from app.services.brackets import AGE_CATEGORIES
 from sqlalchemy.orm import joinedload
-router = APIRouter(prefix="/competitions", tags=["Competitions"])
+router = APIRouter(prefix="/competitions", tags=["Competitions"], route_class=CachedRoute)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 @router.post("/", response_model=CompetitionRead)
 async def create_competition(competition: CompetitionCreate, db: AsyncSession = Depends(get_db)):
-    new_comp = Competition(**competition.dict())
+    new_comp = Competition(**competition.model_dump())
     db.add(new_comp)
     await db.commit()
 
@@ -33,37 +40,50 @@ async def create_competition(competition: CompetitionCreate, db: AsyncSession =
     return comp_with_venue
 
 @router.get("/", response_model=List[CompetitionRead])
-async def get_all_competitions(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Competition).options(joinedload(Competition.venue).joinedload(Venue.city))
-    )
+@cached("competitions", "venues", "cities")
+async def get_all_competitions(
+    response: Response,
+    status: Optional[str] = None,
+    venue_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, description="start_date >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="start_date < date_to"),
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    q = select(Competition).options(joinedload(Competition.venue).joinedload(Venue.city))
+    if status is not None:
+        q = q.where(Competition.status == status)
+    if venue_id is not None:
+        q = q.where(Competition.venue_id == venue_id)
+    q = date_range(q, Competition.start_date, date_from, date_to)
+    result = await db.execute(paginate(q, Competition.id, page))
     competitions = result.scalars().all()
 
     for comp in competitions:
         if comp.venue and comp.venue.city:
             comp.venue.city_name = comp.venue.city.name  # ← вручную прокидываем
 
-    return competitions
+    return set_next_cursor(response, competitions, page)
 
 @router.post("/venues/", response_model=VenueRead)
 async def create_venue(venue: VenueCreate, db: AsyncSession = Depends(get_db)):
-    new_venue = Venue(**venue.dict())
+    new_venue = Venue(**venue.model_dump())
     db.add(new_venue)
     await db.commit()
     await db.refresh(new_venue)
+    reference.invalidate("venues")
     return new_venue
 
 @router.get("/venues/", response_model=List[VenueRead])
-async def get_all_venues(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Venue).options(joinedload(Venue.city))
-    )
-    venues = result.scalars().all()
+async def get_all_venues(
+    request: Request,
+    city_id: Optional[int] = None,
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    # справочник площадок (с city_name) — из кэша, см. app/services/reference.py
+    return await reference.respond(request, db, "venues", page, city_id=city_id)
 
-    for v in venues:
-        v.city_name = v.city.name if v.city else None  # безопасно
-
-    return venues
 @router.delete("/{competition_id}")
 async def delete_competition(competition_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Competition).where(Competition.id == competition_id))
@@ -74,5 +94,134 @@ async def delete_competition(competition_id: int, db: AsyncSession = Depends(get
 
     await db.delete(competition)
     await db.commit()
+    standings.invalidate(competition_id)
+
+    return {"detail": "Competition deleted"}
+
+
+# --- Сводка для панели организатора ---
+
+@router.get("/{competition_id}/aggregates", response_model=CompetitionAggregates)
+@cached(
+    "competitions",
+    "applications",
+    "application_individual_participants",
+    "application_team_participants",
+    "users",
+    "additional_info",
+    "countries",
+)
+async def get_competition_aggregates(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Заявки по статусам, участники по статусам / весовым категориям /
+    странам и число команд — агрегатами в SQL. Ответ кэшируется и
+    сбрасывается любым изменением заявок, участников или их анкет.
+    """
+    if await db.get(Competition, competition_id) is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    return await aggregates.competition_aggregates(db, competition_id)
+
+
+# --- Стартовый список (жеребьёвка, взвешивание) ---
+
+@router.get("/{competition_id}/roster", response_model=List[RosterEntryRead])
+@cached("competitions", "competition_roster")
+async def get_roster(
+    competition_id: int,
+    response: Response,
+    weight_class: Optional[str] = Query(None, description="Например, -73, +100, open"),
+    age_category: Optional[str] = Query(
+        None, pattern="^(%s)$" % "|".join(name for name, _, _ in AGE_CATEGORIES)
+    ),
+    gender: Optional[str] = Query(None, pattern="^(M|F)$"),
+    country_id: Optional[int] = None,
+    include_inactive: bool = Query(False, description="С отклонёнными и отозванными"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Участники соревнования одной таблицей (индивидуальные и из командных
+    заявок) с готовыми весовой и возрастной категориями; выборка по индексу
+    (соревнование, категория), порядок — категория, фамилия.
+    """
+    if await db.get(Competition, competition_id) is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    rows = (await db.execute(roster.draw_list(
+        competition_id,
+        weight_class=weight_class,
+        age_category=age_category,
+        gender=gender,
+        country_id=country_id,
+        include_inactive=include_inactive,
+    ))).all()
+    return fast_list_response(response, RosterEntryRead, rows)
+
+
+@router.post("/{competition_id}/roster/rebuild", response_model=RosterRebuildResult)
+async def rebuild_roster(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Пересобрать стартовый список из заявок (после правок в обход API, смены даты)."""
+    if await db.get(Competition, competition_id) is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    entries = await roster.rebuild(db, competition_id)
+    await db.commit()
+    return RosterRebuildResult(competition_id=competition_id, entries=entries)
+
+
+@router.get("/{competition_id}/duplicates", response_model=DuplicateReport)
+@cached("competitions", "competition_roster")
+async def get_duplicates(
+    competition_id: int,
+    min_score: Optional[float] = Query(None, ge=0, le=1, description="Порог сходства имён (по умолчанию DEDUP_MIN_SCORE)"),
+    application_id: Optional[int] = Query(None, description="Только пары с участниками этой заявки"),
+    include_inactive: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Вероятные дубли спортсменов в стартовом списке: одна дата рождения и
+    совпадающее с учётом транслитерации имя (или один и тот же пользователь).
+    """
+    if await db.get(Competition, competition_id) is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    rows = await dedup.competition_rows(db, competition_id, include_inactive)
+    pairs = dedup.find_pairs(
+        rows,
+        min_score=min_score,
+        only_applications={application_id} if application_id is not None else None,
+    )
+    return DuplicateReport(competition_id=competition_id, participants=len(rows), pairs=pairs)
+
+
+# --- Таблица результатов и медальный зачёт ---
 
-    return {"detail": "Competition deleted"}
\ No newline at end of file
+async def _standings_book(competition_id: int, db: AsyncSession, rebuild: bool = False):
+    book = await standings.get_book(db, competition_id, rebuild=rebuild)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+    return book
+
+
+@router.get("/{competition_id}/standings", response_model=StandingsRead)
+async def get_standings(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Победы / поражения / очки спортсменов и призёры категорий (из памяти, без пересчёта)."""
+    book = await _standings_book(competition_id, db)
+    return book.standings()
+
+
+@router.get("/{competition_id}/standings/medals", response_model=List[MedalRow])
+async def get_medal_table(
+    competition_id: int,
+    by: str = Query("country", pattern="^(country|team)$", description="Зачёт по странам или командам"),
+    db: AsyncSession = Depends(get_db),
+):
+    book = await _standings_book(competition_id, db)
+    return book.medal_table(by)
+
+
+@router.post("/{competition_id}/standings/rebuild", response_model=StandingsRebuildResult)
+async def rebuild_standings(competition_id: int, db: AsyncSession = Depends(get_db)):
+    """Полный пересчёт из таблицы matches (после рестарта, ручной правки БД и т.п.)."""
+    book = await _standings_book(competition_id, db, rebuild=True)
+    return StandingsRebuildResult(
+        competition_id=competition_id,
+        matches=len(book.results),
+        athletes=len(book.athletes),
+    )
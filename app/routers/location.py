@@ -1,25 +1,43 @@
 # routers/location.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
+from app.core.pagination import KeysetPage
+from app.core.profiling import ProfiledRoute
 
-from app.models.user import City, Country
 from app.schemas.location import CityRead, CountryRead
-from typing import List
+from app.schemas.user import RoleRead
+from app.services import reference
+from typing import List, Optional
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# Справочники отдаются из кэша (app/services/reference.py) с ETag
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 @router.get("/cities/", response_model=List[CityRead])
-async def get_cities(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(City))
-    return result.scalars().all()
+async def get_cities(
+    request: Request,
+    country_id: Optional[int] = None,
+    q: Optional[str] = Query(None, max_length=100, description="Начало названия города"),
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    return await reference.respond(request, db, "cities", page, prefix=q, country_id=country_id)
 
 @router.get("/countries/", response_model=List[CountryRead])
-async def get_countries(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Country))
-    return result.scalars().all()
+async def get_countries(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=100, description="Начало названия страны"),
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    return await reference.respond(request, db, "countries", page, prefix=q)
+
+@router.get("/roles/", response_model=List[RoleRead])
+async def get_roles(
+    request: Request,
+    page: KeysetPage = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    return await reference.respond(request, db, "roles", page)
@@ -1,39 +1,199 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, insert, update
 from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_db
+from app.core.pagination import KeysetPage, paginate, date_range, set_next_cursor
+from app.core.profiling import ProfiledRoute
+from app.core.responses import fast_list_response
+from app.models.competition import Competition
 from app.models.match import Match
-from app.schemas.match import MatchCreate, MatchRead
+from app.schemas.match import (
+    MATCH_CREATE_LIST,
+    MatchCreate,
+    MatchRead,
+    BracketGenerate,
+    BracketGenerateResult,
+    BracketCategorySummary,
+    MatchBatchJob,
+    MatchUpdate,
+    MatchChange,
+    ScheduleRequest,
+    ScheduleResult,
+    ScheduledMatch,
+)
+from app.services import brackets, jobs, live, scheduler, standings
+from app.services import matches as match_service
 
-router = APIRouter(prefix="/matches", tags=["Matches"])
+router = APIRouter(prefix="/matches", tags=["Matches"], route_class=ProfiledRoute)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 @router.post("/", response_model=MatchRead)
 async def create_match(match: MatchCreate, db: AsyncSession = Depends(get_db)):
-    new_match = Match(**match.dict())
+    new_match = Match(**match.model_dump())
     db.add(new_match)
     await db.commit()
     await db.refresh(new_match)
+    row = match_service.as_row(new_match)
+    standings.apply_match(row)
+    live.publish_match("match.created", row)
     return new_match
 
+@router.post("/brackets", response_model=BracketGenerateResult)
+async def generate_brackets(
+    params: BracketGenerate,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Строит сетки по одобренным участникам соревнования: категории
+    пол / возраст / вес, посев по рангу, затем олимпийская система,
+    двойное выбывание или круговые пулы. Всё — в одной транзакции.
+    """
+    competition = await db.get(Competition, params.competition_id)
+    if competition is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    on_date = (competition.start_date or datetime.utcnow()).date()
+    athletes = await brackets.load_athletes(db, params.competition_id)
+    groups = brackets.group_athletes(athletes, on_date)
+    generated = brackets.generate(groups, params.format, params.pool_size, params.seed)
+
+    if params.replace:
+        await db.execute(
+            delete(Match).where(
+                Match.competition_id == params.competition_id,
+                Match.category.is_not(None),
+            )
+        )
+
+    rows = [
+        {**m, "competition_id": params.competition_id}
+        for matches in generated.values()
+        for m in matches
+    ]
+    if rows:
+        await db.execute(insert(Match), rows)
+    await db.commit()
+    standings.invalidate(params.competition_id)
+    live.publish_event(
+        "bracket.generated",
+        params.competition_id,
+        {"competition_id": params.competition_id, "matches_created": len(rows)},
+    )
+
+    return BracketGenerateResult(
+        competition_id=params.competition_id,
+        matches_created=len(rows),
+        categories=[
+            BracketCategorySummary(
+                category=category, athletes=len(groups[category]), matches=len(matches)
+            )
+            for category, matches in generated.items()
+        ],
+    )
+
+
+@router.post("/schedule", response_model=ScheduleResult)
+async def schedule_matches(
+    params: ScheduleRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Раскладывает матчи соревнования по татами и времени (app/services/scheduler.py):
+    порядок туров сетки, отдых спортсменов, занятость судей. С apply=true
+    mat и match_time записываются одним executemany, версия матчей растёт.
+    """
+    competition = await db.get(Competition, params.competition_id)
+    if competition is None:
+        raise HTTPException(status_code=404, detail="Competition not found")
+
+    q = select(
+        Match.id,
+        Match.category,
+        Match.bracket,
+        Match.round,
+        Match.red_id,
+        Match.blue_id,
+        Match.referee_id,
+        Match.judge_id,
+    ).where(Match.competition_id == params.competition_id)
+    if not params.include_decided:
+        q = q.where(Match.winner_id.is_(None))
+    matches = [dict(r) for r in (await db.execute(q)).mappings()]
+
+    plan = scheduler.schedule(
+        matches, params.mats, params.match_minutes, params.rest_minutes
+    )
+    start = params.start_time or competition.start_date or datetime.utcnow()
+    slots = [
+        ScheduledMatch(
+            match_id=s.match_id, mat=s.mat, match_time=start + timedelta(minutes=s.start)
+        )
+        for s in sorted(plan.slots, key=lambda s: (s.start, s.mat))
+    ]
+
+    if params.apply and slots:
+        table = Match.__table__
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(mat=bindparam("b_mat"), match_time=bindparam("b_time"), version=table.c.version + 1),
+            [{"b_id": s.match_id, "b_mat": s.mat, "b_time": s.match_time} for s in slots],
+        )
+        await db.commit()
+        live.publish_event(
+            "schedule.updated",
+            params.competition_id,
+            {"competition_id": params.competition_id, "matches": len(slots)},
+        )
+
+    return ScheduleResult(
+        competition_id=params.competition_id,
+        matches=len(slots),
+        mats=params.mats,
+        start_time=start,
+        end_time=start + timedelta(minutes=plan.makespan),
+        lower_bound_end=start + timedelta(minutes=plan.lower_bound),
+        slots=slots,
+    )
+
+
 @router.get("/", response_model=List[MatchRead])
 async def list_matches(
+    response: Response,
     competition_id: Optional[int] = Query(None, description="ID соревнования для фильтрации"),
+    date_from: Optional[datetime] = Query(None, description="match_time >= date_from"),
+    date_to: Optional[datetime] = Query(None, description="match_time < date_to"),
+    page: KeysetPage = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
     """
-    Возвращает все матчи, либо только по заданному competition_id.
+    Возвращает страницу матчей (keyset по id), опционально по competition_id
+    и диапазону времени матча.
     """
-    q = select(Match)
+    q = select(*Match.__table__.c)
     if competition_id is not None:
         q = q.where(Match.competition_id == competition_id)
+    q = date_range(q, Match.match_time, date_from, date_to)
+    q = paginate(q, Match.id, page)
 
     result = await db.execute(q)
-    return result.scalars().all()
+    rows = set_next_cursor(response, result.all(), page)
+    return fast_list_response(response, MatchRead, rows)
 
 @router.get("/{match_id}", response_model=MatchRead)
 async def get_match(match_id: int, db: AsyncSession = Depends(get_db)):
@@ -42,14 +202,180 @@ async def get_match(match_id: int, db: AsyncSession = Depends(get_db)):
     if match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     return match
-@router.post("/batch", response_model=List[MatchRead])
-async def create_matches_batch(
-    matches: List[MatchCreate], 
-    db: AsyncSession = Depends(get_db)
+@router.patch(
+    "/{match_id}",
+    response_model=MatchRead,
+    summary="Обновление матча (счёт, победитель, расписание) с проверкой версии",
+)
+async def update_match(
+    match_id: int,
+    match_upd: MatchUpdate,
+    db: AsyncSession = Depends(get_db),
 ):
-    new = [Match(**m.dict()) for m in matches]
-    db.add_all(new)
+    """
+    Compare-and-swap без блокировок: UPDATE применяется, только если version
+    в БД совпадает с присланной клиентом, и увеличивает её на 1. Если матч уже
+    изменили (например, второй судья) — 409, клиент перечитывает матч и повторяет.
+    Каждое успешное изменение публикуется в табло как событие match.changed.
+    """
+    changes = match_upd.model_dump(exclude_unset=True, exclude={"version"})
+    if not changes:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+
+    result = await db.execute(
+        update(Match)
+        .where(Match.id == match_id, Match.version == match_upd.version)
+        .values(**changes, version=Match.version + 1)
+        .returning(*Match.__table__.c)
+    )
+    row = result.mappings().first()
+    if row is None:
+        await db.rollback()
+        current = await db.get(Match, match_id)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Match not found")
+        raise HTTPException(
+            status_code=409,
+            detail={"msg": "Match was modified concurrently", "version": current.version},
+        )
     await db.commit()
-    for m in new: await db.refresh(m)
-    return new
 
+    standings.apply_match(dict(row))
+    change = MatchChange(
+        match_id=row["id"],
+        competition_id=row["competition_id"],
+        version=row["version"],
+        mat=row["mat"],
+        changes={field: row[field] for field in changes},
+    )
+    live.publish_event("match.changed", row["competition_id"], change.model_dump(), mat=row["mat"])
+    return dict(row)
+
+
+@router.post(
+    "/batch",
+    response_model=List[MatchRead],
+    responses={202: {"model": MatchBatchJob, "description": "Принято в фоновую обработку"}},
+)
+async def create_matches_batch(
+    matches: List[MatchCreate],
+    mode: str = Query("sync", pattern="^(sync|async)$", description="async — вернуть id задачи сразу"),
+    idempotency_key: Optional[str] = Header(None, max_length=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Создаёт матчи пачкой: INSERT ... RETURNING кусками, без refresh на каждую строку.
+    С заголовком Idempotency-Key повтор запроса вернёт уже созданные матчи
+    (без повторных событий табло); тот же ключ с другим телом — 422.
+    В режиме mode=async загрузка выполняется в фоне, статус — /matches/batch/jobs/{id}.
+    """
+    rows = MATCH_CREATE_LIST.dump_python(matches)
+
+    def publish(created, replayed):
+        if replayed:
+            return
+        for m in created:
+            standings.apply_match(m)
+            live.publish_match("match.created", m)
+
+    try:
+        if mode == "async":
+            job_key = None
+            if idempotency_key:
+                digest = match_service.request_hash(rows)
+                # ключ, уже сохранённый в БД, проверяется сразу (422 вместо ошибки задачи)
+                await match_service.stored_ids(db, idempotency_key, digest)
+                job_key = f"{idempotency_key}:{digest}"
+
+            async def work():
+                async with AsyncSessionLocal() as session:
+                    created, replayed = await match_service.create_matches_batch(
+                        session, rows, idempotency_key
+                    )
+                publish(created, replayed)
+                return [m["id"] for m in created]
+
+            job = jobs.submit(match_service.BATCH_SCOPE, work, key=job_key)
+            return JSONResponse(status_code=202, content=_job_read(job).model_dump())
+
+        created, replayed = await match_service.create_matches_batch(db, rows, idempotency_key)
+    except match_service.IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    publish(created, replayed)
+    return created
+
+
+def _job_read(job) -> MatchBatchJob:
+    return MatchBatchJob(
+        id=job.id,
+        status=job.status,
+        matches_created=len(job.result) if job.result is not None else None,
+        match_ids=job.result,
+        error=job.error,
+    )
+
+
+@router.get("/batch/jobs/{job_id}", response_model=MatchBatchJob)
+async def get_matches_batch_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_read(job)
+
+
+# --- Живое табло ---
+
+def _live_topic(competition_id: int, mat: Optional[int]) -> str:
+    if mat is not None:
+        return live.mat_topic(competition_id, mat)
+    return live.competition_topic(competition_id)
+
+
+@router.get("/live/events", summary="Поток событий табло (Server-Sent Events)")
+async def live_events_sse(
+    request: Request,
+    competition_id: int,
+    mat: Optional[int] = Query(None, description="Только матчи этого татами"),
+):
+    """
+    Отдаёт события матчей соревнования (или одного татами) в формате SSE.
+    Клиент получает только изменения, без повторных запросов к списку матчей.
+    """
+    subscription = live.get_broker().subscribe(_live_topic(competition_id, mat))
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=settings.LIVE_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/live/ws")
+async def live_events_ws(
+    websocket: WebSocket,
+    competition_id: int,
+    mat: Optional[int] = None,
+):
+    """То же, что /live/events, но по WebSocket (одно событие — одно сообщение)."""
+    await websocket.accept()
+    subscription = live.get_broker().subscribe(_live_topic(competition_id, mat))
+    try:
+        while True:
+            message = await subscription.get(timeout=settings.LIVE_HEARTBEAT_SECONDS)
+            await websocket.send_text(message if message is not None else '{"type": "ping"}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
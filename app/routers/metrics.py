@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import profiling
+from app.core.metrics import render_latest
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Metrics"], route_class=ProfiledRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/queries", include_in_schema=False)
+async def slowest_queries():
+    """Самый медленный SQL-запрос каждого маршрута (по профилируемым запросам)."""
+    return profiling.slowest_queries()
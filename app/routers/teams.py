@@ -1,20 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
+from app.core.pagination import KeysetPage, paginate, set_next_cursor
+from app.core.profiling import ProfiledRoute
+from app.core.responses import fast_list_response
 from app.models.team import Team, TeamMember
 from app.models.user import User
 from app.schemas.team import TeamRead, TeamMemberCreate, TeamMemberRead
 from app.routers.auth import get_current_user
 
-router = APIRouter(prefix="/teams", tags=["Teams"])
-
-
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+router = APIRouter(prefix="/teams", tags=["Teams"], route_class=ProfiledRoute)
 
 
 # --- Получить команду текущего тренера ---
@@ -47,7 +45,7 @@ async def add_team_member(
     member: TeamMemberCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    new_member = TeamMember(**member.dict())
+    new_member = TeamMember(**member.model_dump())
     db.add(new_member)
     await db.commit()
     await db.refresh(new_member)
@@ -57,14 +55,18 @@ async def add_team_member(
 # --- Получить участников (опционально по team_id) ---
 @router.get("/members/", response_model=List[TeamMemberRead])
 async def get_team_members(
+    response: Response,
     team_id: Optional[int] = None,
+    page: KeysetPage = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(TeamMember)
+    query = select(*TeamMember.__table__.c)
     if team_id is not None:
         query = query.where(TeamMember.team_id == team_id)
+    query = paginate(query, TeamMember.id, page)
     result = await db.execute(query)
-    return result.scalars().all()
+    rows = set_next_cursor(response, result.all(), page)
+    return fast_list_response(response, TeamMemberRead, rows)
 
 
 # --- Удалить участника команды ---
@@ -1,26 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.session import AsyncSessionLocal
+from app.db.session import get_db
 from app.models.team import Team
 from app.models.user import User
 from app.schemas.user import UserCreate, UserRead
-from app.routers.auth import get_current_user  # Только get_current_user, без get_password_hash!
+from app.routers.auth import get_current_user  # хэширование паролей — в app.core.passwords
+from app.core import auth_cache
+from app.core.passwords import PasswordHasherBusy, hash_password
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=ProfiledRoute)
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
 
 # Создание пользователя (регистрация)
 @router.post("/", response_model=UserRead)
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # 1. Создаём пользователя
-    new_user = User(**user.dict())
+    data = user.model_dump()
+    try:
+        data["password"] = await hash_password(user.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Service busy, retry later",
+            headers={"Retry-After": "1"},
+        )
+    new_user = User(**data)
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    # на случай, если под этим логином в кэше остался удалённый пользователь
+    auth_cache.invalidate_user(new_user.login)
 
     # 2. Если роль — тренер, создаём команду
     if new_user.role_id == 2:  # 2 — coach
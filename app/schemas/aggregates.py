@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class WeightClassCount(BaseModel):
+    gender: Optional[str] = None    # "M" / "F"; None — не указан (командные участники)
+    weight_class: str               # как в сетках: "-73", "+100", "open"
+    count: int
+
+
+class CountryCount(BaseModel):
+    country_id: Optional[int] = None
+    country_name: Optional[str] = None
+    count: int
+
+
+class CompetitionAggregates(BaseModel):
+    competition_id: int
+    applications_total: int
+    applications_by_status: Dict[str, int]
+    teams: int                                          # команд с действующими заявками
+    participants_by_status: Dict[str, Dict[str, int]]   # individual / team -> статус -> число
+    active_participants: int                            # не отклонённые в действующих заявках
+    by_weight_class: List[WeightClassCount]
+    by_country: List[CountryCount]
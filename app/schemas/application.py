@@ -1,9 +1,10 @@
 # app/schemas/application.py
 
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Any, Dict, Literal, Optional, List
 from datetime import date, datetime
 
+from app.schemas.duplicates import DuplicatePair
 from app.schemas.user import UserRead   # вложенный тренер
 
 
@@ -17,8 +18,7 @@ class RequestTypeCreate(RequestTypeBase):
 class RequestTypeRead(RequestTypeBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Индивидуальный участник ---
@@ -34,8 +34,7 @@ class ApplicationIndividualParticipantRead(ApplicationIndividualParticipantBase)
     id: int
     user: UserRead     # <-- добавляем вложенную модель пользователя
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Командный участник ---
@@ -55,9 +54,9 @@ class ApplicationTeamParticipantCreate(ApplicationTeamParticipantBase):
 
 class ApplicationTeamParticipantRead(ApplicationTeamParticipantBase):
     id: int
+    source_member_id: Optional[int] = None      # член команды, из которого скопирован
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Заявка ---
@@ -72,6 +71,8 @@ class ApplicationBase(BaseModel):
 class ApplicationCreate(ApplicationBase):
     team_participants: Optional[List[ApplicationTeamParticipantCreate]]       = None
     individual_participants: Optional[List[ApplicationIndividualParticipantCreate]] = None
+    # заявка «с командой»: члены команды team_id копируются в участники на сервере
+    team_member_ids: Optional[List[int]] = None
 
 class ApplicationRead(ApplicationBase):
     id: int
@@ -79,12 +80,52 @@ class ApplicationRead(ApplicationBase):
     team_participants:       List[ApplicationTeamParticipantRead]       = []
     user: Optional[UserRead] = None        # вложенный тренер
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ApplicationBulkError(BaseModel):
+    index: int                  # позиция заявки во входном списке
+    errors: List[Dict[str, Any]]
+
+
+class ApplicationBulkResult(BaseModel):
+    created: List[ApplicationRead] = []
+    errors:  List[ApplicationBulkError] = []
+    possible_duplicates: List[DuplicatePair] = []   # созданные участники, похожие на уже заявленных
+
+
+# Статусы заявки; допустимые переходы — app.services.applications.TRANSITIONS
+ApplicationStatus = Literal["pending", "approved", "rejected", "withdrawn"]
+# заявки в этих статусах не участвуют (сводки, стартовый список)
+INACTIVE_APPLICATION_STATUSES = ("rejected", "withdrawn")
 
 
 class ApplicationUpdate(BaseModel):
-    status: str    # ожидаем "approved" | "rejected" | и др.
+    status: ApplicationStatus
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ApplicationStatusBulk(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+    status: ApplicationStatus
+
+
+class ApplicationTransitionRejected(BaseModel):
+    id: int
+    status: Optional[str] = None    # текущий статус; None — заявки нет
+    reason: str
+
+
+class ApplicationStatusBulkResult(BaseModel):
+    status: ApplicationStatus
+    updated:   List[int] = []       # заявки, переведённые в status
+    unchanged: List[int] = []       # уже были в status
+    rejected:  List[ApplicationTransitionRejected] = []
+    participants_updated: int = 0   # строк участников, сменивших статус вместе с заявкой
+
 
-    class Config:
-        orm_mode = True
+# Валидаторы списков: строятся один раз при импорте, список проверяется
+# одним вызовом pydantic-core вместо model_validate на каждый элемент
+APPLICATION_CREATE_LIST = TypeAdapter(List[ApplicationCreate])
+APPLICATION_READ_LIST = TypeAdapter(List[ApplicationRead])
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -15,8 +15,7 @@ class VenueRead(BaseModel):
     city_id: int
     city_name: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CompetitionBase(BaseModel):
     name: str
@@ -33,5 +32,4 @@ class CompetitionRead(CompetitionBase):
     id: int
     venue: Optional[VenueRead]
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
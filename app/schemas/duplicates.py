@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+
+class DuplicateSide(BaseModel):
+    roster_id: int
+    source: str                     # individual / team
+    participant_id: int
+    application_id: int
+    user_id: Optional[int] = None
+    team_id: Optional[int] = None
+    last_name: Optional[str] = None
+    first_name: Optional[str] = None
+    birth_date: Optional[date] = None
+
+
+class DuplicatePair(BaseModel):
+    score: float                    # 0..1, сходство нормализованных имён
+    reason: str                     # same_user / exact / fuzzy
+    first: DuplicateSide
+    second: DuplicateSide
+
+
+class DuplicateReport(BaseModel):
+    competition_id: int
+    participants: int               # проверено строк стартового списка
+    pairs: List[DuplicatePair]
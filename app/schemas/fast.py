@@ -0,0 +1,94 @@
+# app/schemas/fast.py
+"""
+Быстрая сериализация списков без валидации pydantic.
+
+Для схемы ответа один раз строится план: какие атрибуты читать и какие
+поля — вложенные схемы (UserRead внутри участника и т.п.). Сериализатор
+читает атрибуты напрямую (attrgetter) из ORM-объектов или Row и
+собирает словари; JSON кодируется orjson (если установлен, иначе json).
+
+Данные из БД уже соответствуют схеме, поэтому повторная валидация
+каждого объекта в response_model — чистые накладные расходы. Путь
+включается в эндпоинте явно, через app.core.responses.fast_list_response.
+"""
+import json
+import typing
+from datetime import date, datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+Serializer = Callable[[Any], dict]
+
+
+def _nested_schema(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """(вложенная схема, список ли это) для аннотации поля; (None, False) — простое поле."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return _nested_schema(args[0])
+        return None, False
+    if origin in (list, List):
+        inner, _ = _nested_schema(typing.get_args(annotation)[0])
+        return inner, inner is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def serializer(schema: Type[BaseModel]) -> Serializer:
+    """Скомпилированный сериализатор объекта в словарь полей схемы."""
+    names = tuple(schema.model_fields)
+    getter = attrgetter(*names)
+    nested = []
+    for i, (name, field) in enumerate(schema.model_fields.items()):
+        inner, many = _nested_schema(field.annotation)
+        if inner is not None:
+            nested.append((i, serializer(inner), many))
+
+    if len(names) == 1:
+        def read(obj):
+            return (getter(obj),)
+    else:
+        read = getter
+
+    if not nested:
+        def serialize(obj):
+            return dict(zip(names, read(obj)))
+        return serialize
+
+    def serialize(obj):
+        values = list(read(obj))
+        for i, convert, many in nested:
+            value = values[i]
+            if value is not None:
+                values[i] = [convert(v) for v in value] if many else convert(value)
+        return dict(zip(names, values))
+
+    return serialize
+
+
+def serialize_many(schema: Type[BaseModel], items: Iterable[Any]) -> List[dict]:
+    convert = serializer(schema)
+    return [convert(item) for item in items]
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
@@ -1,14 +1,14 @@
 # schemas/location.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
 
 class CityRead(BaseModel):
     id: int
     name: str
-    class Config:
-        from_attributes = True
+    country_id: Optional[int] = None
+    model_config = ConfigDict(from_attributes=True)
 
 class CountryRead(BaseModel):
     id: int
     name: str
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
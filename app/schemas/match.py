@@ -1,11 +1,11 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 
 class MatchBase(BaseModel):
-    red_id:        int
-    blue_id:       int
+    red_id:        Optional[int] = None   # пусто у матчей следующих туров сетки
+    blue_id:       Optional[int] = None
     winner_id:     Optional[int] = None
     competition_id:int
     referee_id:    Optional[int] = None
@@ -13,6 +13,11 @@ class MatchBase(BaseModel):
     match_time:    Optional[datetime] = None
     score:         Optional[int] = None
     comment:       Optional[str] = None
+    category:      Optional[str] = None
+    bracket:       Optional[str] = None
+    round:         Optional[int] = None
+    position:      Optional[int] = None
+    mat:           Optional[int] = None
 
 
 class MatchCreate(MatchBase):
@@ -21,6 +26,88 @@ class MatchCreate(MatchBase):
 
 class MatchRead(MatchBase):
     id: int
+    version: int = 1
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MatchUpdate(BaseModel):
+    """Частичное обновление матча; version — версия, которую видел клиент."""
+    version:    int
+    red_id:     Optional[int] = None
+    blue_id:    Optional[int] = None
+    winner_id:  Optional[int] = None
+    referee_id: Optional[int] = None
+    judge_id:   Optional[int] = None
+    match_time: Optional[datetime] = None
+    score:      Optional[int] = None
+    comment:    Optional[str] = None
+    mat:        Optional[int] = None
+
+
+class MatchChange(BaseModel):
+    """Компактная запись об изменении матча для табло и таблиц результатов."""
+    match_id:       int
+    competition_id: Optional[int] = None
+    version:        int
+    mat:            Optional[int] = None
+    changes:        Dict[str, Any]
+
+
+class BracketGenerate(BaseModel):
+    competition_id: int
+    format: Literal["single", "double", "round_robin", "auto"] = "auto"
+    pool_size: int = Field(5, ge=2)     # для round_robin / auto
+    seed: Optional[int] = None      # для воспроизводимой жеребьёвки
+    replace: bool = False           # удалить ранее сгенерированные матчи
+
+
+class BracketCategorySummary(BaseModel):
+    category: str
+    athletes: int
+    matches: int
+
+
+class BracketGenerateResult(BaseModel):
+    competition_id: int
+    matches_created: int
+    categories: List[BracketCategorySummary]
+
+
+class ScheduleRequest(BaseModel):
+    competition_id: int
+    mats: int = Field(..., ge=1, le=100)
+    start_time: Optional[datetime] = None     # по умолчанию — начало соревнования
+    match_minutes: int = Field(6, ge=1)       # слот матча: схватка + подготовка
+    rest_minutes: int = Field(15, ge=0)       # минимальный отдых спортсмена
+    include_decided: bool = False             # планировать и уже сыгранные матчи
+    apply: bool = True                        # записать mat / match_time в матчи
+
+
+class ScheduledMatch(BaseModel):
+    match_id: int
+    mat: int
+    match_time: datetime
+
+
+class ScheduleResult(BaseModel):
+    competition_id: int
+    matches: int
+    mats: int
+    start_time: datetime
+    end_time: datetime
+    lower_bound_end: datetime                # раньше этого времени закончить нельзя
+    slots: List[ScheduledMatch]
+
+
+class MatchBatchJob(BaseModel):
+    id: str
+    status: str                     # pending | running | done | failed
+    matches_created: Optional[int] = None
+    match_ids: Optional[List[int]] = None
+    error: Optional[str] = None
+
+
+# Валидаторы списков (строятся один раз при импорте)
+MATCH_CREATE_LIST = TypeAdapter(List[MatchCreate])
+MATCH_READ_LIST = TypeAdapter(List[MatchRead])
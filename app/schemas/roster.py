@@ -0,0 +1,33 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import date
+
+
+class RosterEntryRead(BaseModel):
+    id: int
+    competition_id: int
+    application_id: int
+    source: str                     # individual / team
+    participant_id: int
+    user_id: Optional[int] = None
+    team_id: Optional[int] = None
+    last_name: Optional[str] = None
+    first_name: Optional[str] = None
+    middle_name: Optional[str] = None
+    gender: Optional[str] = None
+    birth_date: Optional[date] = None
+    weight: Optional[int] = None
+    weight_class: str
+    age_category: str
+    country_id: Optional[int] = None
+    city_id: Optional[int] = None
+    rank: Optional[str] = None
+    status: str
+    application_status: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RosterRebuildResult(BaseModel):
+    competition_id: int
+    entries: int
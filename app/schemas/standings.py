@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class AthleteStanding(BaseModel):
+    user_id: int
+    country_id: Optional[int] = None
+    team_id: Optional[int] = None
+    matches: int
+    wins: int
+    losses: int
+    points: int
+
+
+class CategoryPodium(BaseModel):
+    category: str
+    gold: Optional[int] = None
+    silver: Optional[int] = None
+    bronze: List[int] = []
+
+
+class StandingsRead(BaseModel):
+    competition_id: int
+    matches_decided: int
+    athletes: List[AthleteStanding]
+    podiums: List[CategoryPodium]
+
+
+class MedalRow(BaseModel):
+    id: Optional[int] = None    # country_id или team_id; None — не указано
+    gold: int
+    silver: int
+    bronze: int
+    total: int
+
+
+class StandingsRebuildResult(BaseModel):
+    competition_id: int
+    matches: int
+    athletes: int
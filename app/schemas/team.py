@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date
 
@@ -11,8 +11,7 @@ class TeamCreate(TeamBase):
 
 class TeamRead(TeamBase):
     id: int
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TeamMemberBase(BaseModel):
     team_id: int
@@ -29,5 +28,4 @@ class TeamMemberCreate(TeamMemberBase):
 
 class TeamMemberRead(TeamMemberBase):
     id: int
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
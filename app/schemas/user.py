@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import date
 
@@ -27,8 +27,7 @@ class UserRead(UserBase):
     city_id: int
     country_id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserCreateFrontend(BaseModel):
     fullName: str
@@ -67,5 +66,11 @@ class AdditionalInfoCreate(AdditionalInfoBase):
 class AdditionalInfoRead(AdditionalInfoBase):
     id: int
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RoleRead(BaseModel):
+    id: int
+    name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
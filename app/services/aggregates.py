@@ -0,0 +1,121 @@
+# app/services/aggregates.py
+"""
+Сводка по соревнованию для панели организатора: заявки по статусам,
+участники по статусам, весовым категориям и странам, число команд.
+
+Всё считается в БД (COUNT ... GROUP BY), наружу уходят только счётчики.
+Индивидуальные и командные участники сводятся одним UNION ALL
+(вес / пол / страна индивидуального — из users и additional_info),
+весовая категория — CASE по тем же границам, что в сетках
+(brackets.weight_class_expr). Кэширование — на эндпоинте (@cached).
+"""
+from typing import Dict
+
+from sqlalchemy import and_, distinct, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+)
+from app.models.user import AdditionalInfo, Country, User
+from app.schemas.aggregates import CompetitionAggregates, CountryCount, WeightClassCount
+from app.schemas.application import INACTIVE_APPLICATION_STATUSES
+from app.services.brackets import weight_class_expr
+
+
+def _participants(competition_id: int):
+    """Участники обеих таблиц одной выборкой: вид, статусы, пол, вес, страна."""
+    ind = ApplicationIndividualParticipant
+    team = ApplicationTeamParticipant
+    individual = (
+        select(
+            literal("individual").label("kind"),
+            ind.status.label("status"),
+            Application.status.label("application_status"),
+            func.upper(func.substr(AdditionalInfo.gender, 1, 1)).label("gender"),
+            AdditionalInfo.weight.label("weight"),
+            User.country_id.label("country_id"),
+        )
+        .join(Application, Application.id == ind.application_id)
+        .join(User, User.id == ind.user_id)
+        .outerjoin(AdditionalInfo, AdditionalInfo.id == User.additional_info_id)
+        .where(Application.competition_id == competition_id)
+    )
+    teams = (
+        select(
+            literal("team").label("kind"),
+            team.status.label("status"),
+            Application.status.label("application_status"),
+            literal(None).label("gender"),
+            team.weight.label("weight"),
+            team.country_id.label("country_id"),
+        )
+        .join(Application, Application.id == team.application_id)
+        .where(Application.competition_id == competition_id)
+    )
+    return union_all(individual, teams).subquery("participants")
+
+
+def _weight_order(label: str) -> float:
+    """-60 < -66 < ... < +100 < open."""
+    if label == "open":
+        return float("inf")
+    return int(label[1:]) + (0.5 if label[0] == "+" else 0)
+
+
+async def competition_aggregates(db: AsyncSession, competition_id: int) -> CompetitionAggregates:
+    """Пять агрегирующих запросов; строк участников в Python не поднимается."""
+    by_status = dict((await db.execute(
+        select(Application.status, func.count())
+        .where(Application.competition_id == competition_id)
+        .group_by(Application.status)
+    )).all())
+
+    teams = (await db.execute(
+        select(func.count(distinct(Application.team_id))).where(
+            Application.competition_id == competition_id,
+            Application.status.not_in(INACTIVE_APPLICATION_STATUSES),
+        )
+    )).scalar_one()
+
+    p = _participants(competition_id)
+    participants: Dict[str, Dict[str, int]] = {}
+    for kind, status, count in (await db.execute(
+        select(p.c.kind, p.c.status, func.count()).group_by(p.c.kind, p.c.status)
+    )).all():
+        participants.setdefault(kind, {})[status] = count
+
+    active = and_(
+        p.c.status != "rejected",
+        p.c.application_status.not_in(INACTIVE_APPLICATION_STATUSES),
+    )
+    weight_class = weight_class_expr(p.c.gender, p.c.weight).label("weight_class")
+    by_weight = (await db.execute(
+        select(p.c.gender, weight_class, func.count())
+        .where(active)
+        .group_by(p.c.gender, weight_class)
+    )).all()
+
+    by_country = (await db.execute(
+        select(p.c.country_id, Country.name, func.count())
+        .outerjoin(Country, Country.id == p.c.country_id)
+        .where(active)
+        .group_by(p.c.country_id, Country.name)
+        .order_by(func.count().desc(), p.c.country_id)
+    )).all()
+
+    return CompetitionAggregates(
+        competition_id=competition_id,
+        applications_total=sum(by_status.values()),
+        applications_by_status=by_status,
+        teams=teams,
+        participants_by_status=participants,
+        active_participants=sum(row[2] for row in by_weight),
+        by_weight_class=[
+            WeightClassCount(gender=g, weight_class=w, count=n)
+            for g, w, n in sorted(by_weight, key=lambda r: (r[0] or "", _weight_order(r[1])))
+        ],
+        by_country=[CountryCount(country_id=c, country_name=name, count=n) for c, name, n in by_country],
+    )
@@ -0,0 +1,356 @@
+# app/services/applications.py
+"""
+Массовое создание заявок: проверка ссылок несколькими IN-запросами,
+вставка заявок и участников через insert().returning() (executemany)
+и сборка ApplicationRead из возвращённых строк без повторного select.
+
+Массовая смена статуса: переходы проверяет сама БД — один
+UPDATE ... WHERE id IN (...) AND status IN (допустимые источники)
+RETURNING, затем участники заявок одним UPDATE на таблицу.
+
+Заявка «с командой» (team_member_ids): выбранные члены команды
+копируются в командных участников одним INSERT ... SELECT из
+team_members прямо в БД; source_member_id хранит ссылку на исходного
+члена команды для последующей синхронизации.
+
+Стартовый список (app/services/roster.py) обновляется здесь же, в той
+же транзакции.
+"""
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, literal, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+    RequestType,
+)
+from app.models.competition import Competition
+from app.models.team import Team, TeamMember
+from app.models.user import User
+from app.services import roster
+from app.schemas.application import (
+    APPLICATION_CREATE_LIST,
+    APPLICATION_READ_LIST,
+    ApplicationCreate,
+    ApplicationRead,
+    ApplicationStatusBulkResult,
+    ApplicationTransitionRejected,
+)
+
+# Допустимые переходы статуса заявки: из -> в
+TRANSITIONS: Dict[str, Set[str]] = {
+    "pending":   {"approved", "rejected", "withdrawn"},
+    "approved":  {"pending", "rejected", "withdrawn"},
+    "rejected":  {"pending", "approved"},
+    "withdrawn": {"pending"},
+}
+
+# Из каких статусов участник переходит вместе с заявкой. Участник,
+# отклонённый отдельно, при одобрении заявки остаётся отклонённым;
+# возврат заявки на рассмотрение (pending) сбрасывает всех участников.
+PARTICIPANTS_FOLLOW: Dict[str, Tuple[str, ...]] = {
+    "approved":  ("pending",),
+    "rejected":  ("pending", "approved"),
+    "withdrawn": ("pending", "approved"),
+    "pending":   ("approved", "rejected", "withdrawn"),
+}
+
+_SOURCES: Dict[str, List[str]] = {
+    target: sorted(s for s, targets in TRANSITIONS.items() if target in targets)
+    for target in TRANSITIONS
+}
+
+
+def _error(loc: Sequence[Any], msg: str) -> Dict[str, Any]:
+    return {"loc": list(loc), "msg": msg}
+
+
+def parse_items(items: Sequence[Any]) -> Tuple[Dict[int, ApplicationCreate], Dict[int, list]]:
+    """
+    Валидирует список целиком: index -> заявка / index -> ошибки.
+    Ошибки раскладываются по индексу из loc; если они есть, корректные
+    элементы проверяются повторно — вторым вызовом, уже без ошибок.
+    """
+    items = list(items)
+    try:
+        return dict(enumerate(APPLICATION_CREATE_LIST.validate_python(items))), {}
+    except ValidationError as e:
+        errors: Dict[int, list] = {}
+        for err in e.errors(include_url=False, include_context=False):
+            index, *loc = err["loc"]
+            errors.setdefault(index, []).append(_error(loc, err["msg"]))
+
+    valid = [i for i in range(len(items)) if i not in errors]
+    parsed = APPLICATION_CREATE_LIST.validate_python([items[i] for i in valid])
+    return dict(zip(valid, parsed)), errors
+
+
+# поля члена команды, обязательные у командного участника (NOT NULL)
+_MEMBER_REQUIRED = (
+    TeamMember.first_name,
+    TeamMember.last_name,
+    TeamMember.weight,
+    TeamMember.birth_date,
+    TeamMember.country_id,
+    TeamMember.city_id,
+)
+
+# колонки участника <- колонки члена команды
+_MEMBER_COPY = ("first_name", "last_name", "middle_name", "weight", "birth_date", "country_id", "city_id")
+
+
+def _copy_members_statement(members_by_app: Dict[int, List[int]]):
+    """
+    Один INSERT ... SELECT из team_members для всех заявок пачки: по
+    SELECT на заявку, склеенных UNION ALL (один член команды может быть
+    в нескольких заявках — на разные соревнования).
+    """
+    p = ApplicationTeamParticipant
+    selects = [
+        select(
+            literal(app_id, p.application_id.type),
+            *(getattr(TeamMember, name) for name in _MEMBER_COPY),
+            literal("pending", p.status.type),
+            TeamMember.id,
+        ).where(TeamMember.id.in_(member_ids))
+        for app_id, member_ids in members_by_app.items()
+    ]
+    return (
+        insert(p)
+        .from_select(
+            ["application_id", *_MEMBER_COPY, "status", "source_member_id"],
+            union_all(*selects) if len(selects) > 1 else selects[0],
+        )
+        .returning(*p.__table__.c)
+    )
+
+
+async def _existing_ids(db: AsyncSession, column, ids) -> set:
+    if not ids:
+        return set()
+    result = await db.execute(select(column).where(column.in_(ids)))
+    return set(result.scalars().all())
+
+
+async def validate_references(
+    db: AsyncSession, parsed: Dict[int, ApplicationCreate]
+) -> Tuple[Dict[int, list], Dict[int, User]]:
+    """
+    Проверяет competition_id, request_type_id, team_id и user_id участников
+    одним запросом на таблицу, а также team_member_ids — члены должны
+    состоять в team_id заявки и иметь все поля, обязательные для участника.
+    Возвращает (ошибки по индексам, пользователи по id).
+    """
+    apps = parsed.values()
+    competitions = await _existing_ids(db, Competition.id, {a.competition_id for a in apps})
+    request_types = await _existing_ids(db, RequestType.id, {a.request_type_id for a in apps})
+    teams = await _existing_ids(db, Team.id, {a.team_id for a in apps if a.team_id is not None})
+
+    user_ids = {
+        p.user_id for a in apps for p in (a.individual_participants or [])
+    }
+    users = {}
+    if user_ids:
+        result = await db.execute(select(User).where(User.id.in_(user_ids)))
+        users = {u.id: u for u in result.scalars().all()}
+
+    member_ids = {m for a in apps for m in (a.team_member_ids or [])}
+    members = {}
+    if member_ids:
+        result = await db.execute(
+            select(TeamMember.id, TeamMember.team_id, *_MEMBER_REQUIRED)
+            .where(TeamMember.id.in_(member_ids))
+        )
+        members = {row.id: row for row in result.all()}
+
+    errors: Dict[int, list] = {}
+    for index, a in parsed.items():
+        item_errors = []
+        if a.competition_id not in competitions:
+            item_errors.append(_error(["competition_id"], "Competition not found"))
+        if a.request_type_id not in request_types:
+            item_errors.append(_error(["request_type_id"], "Request type not found"))
+        if a.team_id is not None and a.team_id not in teams:
+            item_errors.append(_error(["team_id"], "Team not found"))
+        for i, p in enumerate(a.individual_participants or []):
+            if p.user_id not in users:
+                item_errors.append(
+                    _error(["individual_participants", i, "user_id"], "User not found")
+                )
+        member_ids = a.team_member_ids or []
+        if member_ids and a.team_id is None:
+            item_errors.append(_error(["team_member_ids"], "team_id is required"))
+            member_ids = []
+        seen = set()
+        for i, member_id in enumerate(member_ids):
+            loc = ["team_member_ids", i]
+            member = members.get(member_id)
+            if member_id in seen:
+                item_errors.append(_error(loc, "Duplicate team member"))
+            elif member is None or member.team_id != a.team_id:
+                item_errors.append(_error(loc, "Team member not found"))
+            else:
+                missing = [c.key for c in _MEMBER_REQUIRED if getattr(member, c.key) is None]
+                if missing:
+                    item_errors.append(
+                        _error(loc, "Team member has no " + ", ".join(missing))
+                    )
+            seen.add(member_id)
+        if item_errors:
+            errors[index] = item_errors
+    return errors, users
+
+
+async def insert_applications(
+    db: AsyncSession,
+    applications: Sequence[ApplicationCreate],
+    owner: User,
+    users: Dict[int, User],
+) -> List[ApplicationRead]:
+    """
+    Вставляет заявки тренера owner и их участников (по одному
+    INSERT ... RETURNING на таблицу, плюс INSERT ... SELECT для
+    team_member_ids) и собирает ответ из возвращённых строк.
+    Коммит — на вызывающем.
+    """
+    if not applications:
+        return []
+
+    app_rows = (await db.execute(
+        insert(Application).returning(
+            *Application.__table__.c, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "competition_id": a.competition_id,
+                "request_type_id": a.request_type_id,
+                "team_id": a.team_id,
+                "request_date": a.request_date,
+                "user_id": owner.id,
+                "status": "pending",
+            }
+            for a in applications
+        ],
+    )).mappings().all()
+
+    team_params, individual_params = [], []
+    members_by_app: Dict[int, List[int]] = {}
+    for a, row in zip(applications, app_rows):
+        if a.team_member_ids:
+            members_by_app[row["id"]] = a.team_member_ids
+        for p in a.team_participants or []:
+            data = p.model_dump(exclude={"application_id"})
+            data["application_id"] = row["id"]
+            data["status"] = data.get("status") or "pending"
+            team_params.append(data)
+        for p in a.individual_participants or []:
+            data = p.model_dump(exclude={"application_id"})
+            data["application_id"] = row["id"]
+            data["status"] = data.get("status") or "pending"
+            individual_params.append(data)
+
+    team_by_app: Dict[int, list] = {}
+    if team_params:
+        rows = (await db.execute(
+            insert(ApplicationTeamParticipant).returning(
+                *ApplicationTeamParticipant.__table__.c, sort_by_parameter_order=True
+            ),
+            team_params,
+        )).mappings().all()
+        for r in rows:
+            team_by_app.setdefault(r["application_id"], []).append(dict(r))
+    if members_by_app:
+        rows = (await db.execute(_copy_members_statement(members_by_app))).mappings().all()
+        for r in sorted(rows, key=lambda r: r["id"]):
+            team_by_app.setdefault(r["application_id"], []).append(dict(r))
+
+    individual_by_app: Dict[int, list] = {}
+    if individual_params:
+        rows = (await db.execute(
+            insert(ApplicationIndividualParticipant).returning(
+                *ApplicationIndividualParticipant.__table__.c, sort_by_parameter_order=True
+            ),
+            individual_params,
+        )).mappings().all()
+        for r in rows:
+            data = dict(r)
+            data["user"] = users[r["user_id"]]
+            individual_by_app.setdefault(r["application_id"], []).append(data)
+
+    await roster.add_applications(db, [row["id"] for row in app_rows])
+
+    # один вызов валидатора на весь ответ; пользователи — ORM-объекты (from_attributes)
+    return APPLICATION_READ_LIST.validate_python(
+        [
+            {
+                **row,
+                "individual_participants": individual_by_app.get(row["id"], []),
+                "team_participants": team_by_app.get(row["id"], []),
+                "user": owner,
+            }
+            for row in app_rows
+        ],
+        from_attributes=True,
+    )
+
+
+async def change_status(
+    db: AsyncSession,
+    ids: Sequence[int],
+    status: str,
+) -> Tuple[ApplicationStatusBulkResult, Set[int]]:
+    """
+    Переводит заявки ids в status вместе с их участниками. Возвращает
+    отчёт (переведённые / уже бывшие в status / отклонённые с причиной)
+    и соревнования затронутых заявок. Коммит — на вызывающем.
+    """
+    ids = list(dict.fromkeys(ids))
+    rows = (await db.execute(
+        update(Application)
+        .where(Application.id.in_(ids), Application.status.in_(_SOURCES[status]))
+        .values(status=status)
+        .returning(Application.id, Application.competition_id)
+        .execution_options(synchronize_session=False)
+    )).all()
+    moved = {r.id for r in rows}
+    competitions = {r.competition_id for r in rows}
+
+    participants = 0
+    if moved:
+        for model in (ApplicationIndividualParticipant, ApplicationTeamParticipant):
+            result = await db.execute(
+                update(model)
+                .where(model.application_id.in_(moved), model.status.in_(PARTICIPANTS_FOLLOW[status]))
+                .values(status=status)
+                .execution_options(synchronize_session=False)
+            )
+            participants += result.rowcount
+        await roster.apply_status(db, moved, status, PARTICIPANTS_FOLLOW[status])
+
+    # причины отказа — только для непрошедших
+    rest = [i for i in ids if i not in moved]
+    current: Dict[int, str] = {}
+    if rest:
+        current = dict((await db.execute(
+            select(Application.id, Application.status).where(Application.id.in_(rest))
+        )).all())
+
+    report = ApplicationStatusBulkResult(status=status, participants_updated=participants)
+    for app_id in ids:
+        if app_id in moved:
+            report.updated.append(app_id)
+        elif app_id not in current:
+            report.rejected.append(ApplicationTransitionRejected(id=app_id, reason="Заявка не найдена"))
+        elif current[app_id] == status:
+            report.unchanged.append(app_id)
+        else:
+            report.rejected.append(ApplicationTransitionRejected(
+                id=app_id,
+                status=current[app_id],
+                reason=f"Переход {current[app_id]} → {status} не разрешён",
+            ))
+    return report, competitions
@@ -0,0 +1,329 @@
+# app/services/brackets.py
+"""
+Генерация турнирных сеток на сервере.
+
+Спортсмены (одобренные индивидуальные участники заявок) делятся на категории
+пол / возраст / весовая категория, посеиваются и для каждой категории
+строится сетка: олимпийская система, двойное выбывание с утешительной
+сеткой (repechage) или круговые пулы.
+
+Генерация — чистые функции над списками (без ORM), результат — словари,
+готовые к одному INSERT в matches. Поля матча:
+    category  — «M U21 -73»
+    bracket   — main / winners / repechage / final / pool-A ...
+    round     — номер тура внутри категории (общий для основной и
+                утешительной сетки, задаёт порядок проведения)
+    position  — номер матча внутри (bracket, round)
+Матчи следующих туров создаются с пустыми red_id/blue_id.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, case, extract, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import Application, ApplicationIndividualParticipant
+from app.models.user import AdditionalInfo, User
+
+# Верхние границы весовых категорий; последняя категория — «+последняя»
+WEIGHT_CLASSES = {
+    "M": (60, 66, 73, 81, 90, 100),
+    "F": (48, 52, 57, 63, 70, 78),
+}
+
+# (название, минимальный возраст, максимальный возраст) на год соревнования
+AGE_CATEGORIES = (
+    ("U15", 0, 14),
+    ("U18", 15, 17),
+    ("U21", 18, 20),
+    ("Senior", 21, 200),
+)
+
+FORMATS = ("single", "double", "round_robin", "auto")
+
+
+@dataclass
+class Athlete:
+    user_id: int
+    gender: Optional[str]
+    weight: Optional[int]
+    birth_date: Optional[date]
+    country_id: Optional[int] = None
+    rank: Optional[str] = None
+
+
+def weight_class(gender: Optional[str], weight: Optional[int]) -> str:
+    limits = WEIGHT_CLASSES.get((gender or "").upper()[:1], WEIGHT_CLASSES["M"])
+    if weight is None:
+        return "open"
+    for limit in limits:
+        if weight <= limit:
+            return f"-{limit}"
+    return f"+{limits[-1]}"
+
+
+def age_category(birth_date: Optional[date], on_date: date) -> str:
+    if birth_date is None:
+        return "Senior"
+    # возраст считается по году соревнования, как принято в федерациях
+    age = on_date.year - birth_date.year
+    for name, low, high in AGE_CATEGORIES:
+        if low <= age <= high:
+            return name
+    return "Senior"
+
+
+# SQL-варианты тех же правил — для агрегатов и стартового списка (roster)
+
+def weight_class_expr(gender, weight):
+    """Как weight_class; gender — уже нормализованный ("M" / "F" / NULL), неизвестный — по мужской сетке."""
+    default = WEIGHT_CLASSES["M"]
+    whens = [(weight.is_(None), "open")]
+    for g, limits in WEIGHT_CLASSES.items():
+        if g == "M":
+            continue
+        whens += [(and_(gender == g, weight <= limit), f"-{limit}") for limit in limits]
+        whens.append((gender == g, f"+{limits[-1]}"))
+    whens += [(weight <= limit, f"-{limit}") for limit in default]
+    return case(*whens, else_=f"+{default[-1]}")
+
+
+def age_category_expr(birth_date, on_date):
+    """Как age_category: возраст — разница годов даты соревнования и рождения."""
+    age = extract("year", on_date) - extract("year", birth_date)
+    whens = [(birth_date.is_(None), "Senior")]
+    whens += [(age.between(low, high), name) for name, low, high in AGE_CATEGORIES]
+    return case(*whens, else_="Senior")
+
+
+def category_of(athlete: Athlete, on_date: date) -> str:
+    gender = (athlete.gender or "M").upper()[:1]
+    return f"{gender} {age_category(athlete.birth_date, on_date)} {weight_class(gender, athlete.weight)}"
+
+
+def group_athletes(athletes: Iterable[Athlete], on_date: date) -> Dict[str, List[Athlete]]:
+    groups: Dict[str, List[Athlete]] = {}
+    for a in athletes:
+        groups.setdefault(category_of(a, on_date), []).append(a)
+    return groups
+
+
+def _rank_value(rank: Optional[str]) -> int:
+    try:
+        return int(rank)
+    except (TypeError, ValueError):
+        return 0
+
+
+def seed_order(size: int) -> List[int]:
+    """
+    Стандартная расстановка посевов по позициям сетки размера 2^k:
+    для 8 — [1, 8, 4, 5, 2, 7, 3, 6], т.е. первые номера встречаются в финале.
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [s for seed in order for s in (seed, total - seed)]
+    return order
+
+
+def seed_athletes(athletes: Sequence[Athlete], rng: random.Random) -> List[Athlete]:
+    """Сортирует по рангу (по убыванию), равные ранги — в случайном порядке."""
+    shuffled = list(athletes)
+    rng.shuffle(shuffled)
+    return sorted(shuffled, key=lambda a: -_rank_value(a.rank))
+
+
+def _bracket_size(n: int) -> int:
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+def _match(category, bracket, round_no, position, red=None, blue=None) -> dict:
+    return {
+        "category": category,
+        "bracket": bracket,
+        "round": round_no,
+        "position": position,
+        "red_id": red,
+        "blue_id": blue,
+    }
+
+
+def _elimination_rounds(category: str, seeded: Sequence[Athlete], bracket: str) -> List[dict]:
+    """
+    Олимпийская сетка. Посевы без соперника (bye) сразу попадают во второй тур,
+    матчей с пустым соперником в первом туре не создаём.
+    """
+    size = _bracket_size(len(seeded))
+    slots = [
+        seeded[s - 1].user_id if s <= len(seeded) else None
+        for s in seed_order(size)
+    ]
+    matches = []
+    advanced: Dict[int, int] = {}     # позиция 1-го тура -> прошедший без боя
+    for pos in range(size // 2):
+        red, blue = slots[2 * pos], slots[2 * pos + 1]
+        if red is not None and blue is not None:
+            matches.append(_match(category, bracket, 1, pos, red, blue))
+        else:
+            advanced[pos] = red if red is not None else blue
+
+    round_no, count = 2, size // 4
+    while count >= 1:
+        for pos in range(count):
+            red = advanced.get(2 * pos) if round_no == 2 else None
+            blue = advanced.get(2 * pos + 1) if round_no == 2 else None
+            matches.append(_match(category, bracket, round_no, pos, red, blue))
+        round_no += 1
+        count //= 2
+    return matches
+
+
+def single_elimination(category: str, seeded: Sequence[Athlete]) -> List[dict]:
+    if len(seeded) < 2:
+        return []
+    return _elimination_rounds(category, seeded, "main")
+
+
+def _winners_stage(round_no: int) -> int:
+    return 2 * round_no - 1
+
+
+def double_elimination(category: str, seeded: Sequence[Athlete]) -> List[dict]:
+    """
+    Двойное выбывание: основная сетка (winners), утешительная (repechage),
+    куда попадают проигравшие, и финал победителей обеих сеток.
+
+    Туры утешительной сетки чередуются с турами основной: в чётный тур
+    repechage приходят проигравшие очередного тура winners.
+
+    Матч repechage создаётся, только если к нему придут оба соперника:
+    при bye в первом туре winners проигравших меньше, и единственный
+    пришедший в слот спортсмен проходит дальше без боя. Bye бывают только
+    в первом туре, поэтому проигравшие следующих туров есть всегда.
+    """
+    if len(seeded) < 2:
+        return []
+    size = _bracket_size(len(seeded))
+    winners = _elimination_rounds(category, seeded, "winners")
+    for m in winners:
+        m["round"] = _winners_stage(m["round"])
+    if size < 4:
+        return winners
+
+    k = size.bit_length() - 1          # туров в основной сетке
+    matches = list(winners)
+    first_round = {m["position"] for m in winners if m["round"] == _winners_stage(1)}
+    # есть ли спортсмен на выходе слота: сначала — проигравшие 1-го тура winners
+    feeds = [pos in first_round for pos in range(size // 2)]
+    stage = 1
+    count = size // 4
+    for j in range(1, 2 * (k - 1) + 1):
+        # нечётный тур: победители между собой; чётный: против проигравших winners
+        stage = stage + 1 if j % 2 else max(stage + 1, _winners_stage(j // 2 + 1) + 1)
+        if j % 2:
+            inputs = [(feeds[2 * pos], feeds[2 * pos + 1]) for pos in range(count)]
+        else:
+            inputs = [(feeds[pos], True) for pos in range(count)]
+        for pos, (red, blue) in enumerate(inputs):
+            if red and blue:
+                matches.append(_match(category, "repechage", stage, pos))
+        feeds = [red or blue for red, blue in inputs]
+        if j % 2 == 0:
+            count //= 2
+    matches.append(_match(category, "final", stage + 1, 0))
+    return matches
+
+
+def _round_robin_pairs(ids: List[Optional[int]]) -> List[List[tuple]]:
+    """Круговая система методом «карусели»: список туров из пар."""
+    if len(ids) % 2:
+        ids = ids + [None]
+    n = len(ids)
+    rounds = []
+    for _ in range(n - 1):
+        pairs = [(ids[i], ids[n - 1 - i]) for i in range(n // 2)]
+        rounds.append([p for p in pairs if p[0] is not None and p[1] is not None])
+        ids = [ids[0]] + [ids[-1]] + ids[1:-1]
+    return rounds
+
+
+def round_robin_pools(category: str, seeded: Sequence[Athlete], pool_size: int) -> List[dict]:
+    """Делит категорию на пулы (посевы «змейкой») и играет круг в каждом."""
+    if len(seeded) < 2:
+        return []
+    n_pools = max(1, -(-len(seeded) // pool_size))
+    pools: List[List[int]] = [[] for _ in range(n_pools)]
+    for i, a in enumerate(seeded):
+        lap, idx = divmod(i, n_pools)
+        pools[idx if lap % 2 == 0 else n_pools - 1 - idx].append(a.user_id)
+
+    matches = []
+    for p, ids in enumerate(pools):
+        bracket = f"pool-{chr(ord('A') + p)}" if p < 26 else f"pool-{p + 1}"
+        for r, pairs in enumerate(_round_robin_pairs(ids), start=1):
+            for pos, (red, blue) in enumerate(pairs):
+                matches.append(_match(category, bracket, r, pos, red, blue))
+    return matches
+
+
+def generate(
+    groups: Dict[str, List[Athlete]],
+    format: str = "auto",
+    pool_size: int = 5,
+    seed: Optional[int] = None,
+) -> Dict[str, List[dict]]:
+    """
+    Категория -> список матчей по категориям из group_athletes.
+    format=auto: пулы для маленьких категорий, иначе олимпийка.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown bracket format: {format}")
+    if pool_size < 2:
+        raise ValueError("pool_size must be at least 2")
+    rng = random.Random(seed)
+    result = {}
+    for category, group in sorted(groups.items()):
+        seeded = seed_athletes(group, rng)
+        fmt = format
+        if fmt == "auto":
+            fmt = "round_robin" if len(seeded) <= pool_size else "single"
+        if fmt == "single":
+            result[category] = single_elimination(category, seeded)
+        elif fmt == "double":
+            result[category] = double_elimination(category, seeded)
+        else:
+            result[category] = round_robin_pools(category, seeded, pool_size)
+    return result
+
+
+# --- работа с БД ---
+
+async def load_athletes(db: AsyncSession, competition_id: int) -> List[Athlete]:
+    """Одобренные индивидуальные участники соревнования (один запрос)."""
+    p = ApplicationIndividualParticipant
+    result = await db.execute(
+        select(
+            User.id,
+            AdditionalInfo.gender,
+            AdditionalInfo.weight,
+            User.birth_date,
+            User.country_id,
+            AdditionalInfo.rank,
+        )
+        .join(p, p.user_id == User.id)
+        .join(Application, Application.id == p.application_id)
+        .outerjoin(AdditionalInfo, AdditionalInfo.id == User.additional_info_id)
+        .where(
+            Application.competition_id == competition_id,
+            Application.status == "approved",
+            p.status != "rejected",
+        )
+        .distinct()
+    )
+    return [Athlete(*row) for row in result.all()]
@@ -0,0 +1,193 @@
+# app/services/dedup.py
+"""
+Поиск одного и того же спортсмена, заявленного в соревнование дважды
+(например, индивидуально и в составе команды).
+
+Источник — стартовый список (competition_roster): там обе таблицы
+участников уже сведены к одним колонкам. Сравнение:
+  * блокировка по дате рождения — сравниваются только строки с одной
+    датой, поэтому работа растёт почти линейно, а не как n²;
+  * ключ имени: транслитерация кириллицы, снятие диакритики и свёртка
+    вариантов латиницы (kh/h, ts/tz/c, y/j/i, x/ks, двойные буквы) —
+    «Юрий Цой», «Iurii Tsoi» и «Yuri Tzoy» дают один ключ;
+  * нечёткое сходство ключей (difflib, с быстрыми верхними оценками),
+    в том числе с переставленными фамилией и именем.
+Один и тот же user_id — дубль без сравнения имён. Строки без даты
+рождения не проверяются.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.roster import RosterEntry
+from app.schemas.application import INACTIVE_APPLICATION_STATUSES
+from app.schemas.duplicates import DuplicatePair, DuplicateSide
+
+DUPLICATES_HEADER = "X-Possible-Duplicates"   # число вероятных дублей у новой заявки
+
+_CYRILLIC = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "і": "i", "ї": "i", "є": "e", "ґ": "g", "ў": "u",
+})
+
+# порядок важен: длинные сочетания раньше коротких
+_FOLDS = (
+    ("shch", "sh"), ("sch", "sh"), ("tch", "ch"), ("kh", "h"), ("ph", "f"),
+    ("ck", "k"), ("tz", "c"), ("ts", "c"), ("cz", "c"), ("x", "ks"),
+    ("yo", "e"), ("jo", "e"),       # ё: Fyodor / Fjodor / Fedor
+    ("w", "v"), ("q", "k"), ("j", "i"), ("y", "i"),
+)
+_NOT_LETTER = re.compile(r"[^a-z ]+")
+_REPEATS = re.compile(r"(.)\1+")
+
+
+@lru_cache(maxsize=65536)
+def _normalize(part: str) -> str:
+    text = unicodedata.normalize("NFKD", part.casefold().translate(_CYRILLIC))
+    text = _NOT_LETTER.sub("", text.replace("-", " "))
+    for old, new in _FOLDS:
+        text = text.replace(old, new)
+    return " ".join(_REPEATS.sub(r"\1", text).split())
+
+
+def name_key(*parts: Optional[str]) -> str:
+    """Нормализованный ключ имени для сравнения написаний (части кэшируются — имена повторяются)."""
+    return " ".join(filter(None, (_normalize(p) for p in parts if p)))
+
+
+def _bigrams(key: str) -> frozenset:
+    return frozenset(w[i:i + 2] for w in key.split() for i in range(len(w) - 1))
+
+
+@dataclass
+class _Entry:
+    row: object
+    key: str            # «фамилия имя»
+    swapped: str        # «имя фамилия»
+    bigrams: frozenset  # не зависят от порядка слов
+
+
+def _entry(row) -> _Entry:
+    last, first = name_key(row.last_name), name_key(row.first_name)
+    key = f"{last} {first}".strip()
+    return _Entry(row, key, f"{first} {last}".strip(), _bigrams(key))
+
+
+# Дешёвый фильтр перед difflib: доля общих биграмм (коэффициент Дайса).
+# Порог заметно ниже min_score — транслитерация меняет много биграмм,
+# но почти не меняет последовательность букв.
+PREFILTER_DICE = 0.4
+
+
+def _similarity(a: _Entry, b: _Entry, min_score: float) -> float:
+    total = len(a.bigrams) + len(b.bigrams)
+    if not total or 2 * len(a.bigrams & b.bigrams) < PREFILTER_DICE * total:
+        return 0.0
+    best = 0.0
+    for other in (b.key, b.swapped):
+        matcher = SequenceMatcher(None, a.key, other, autojunk=False)
+        # верхние оценки дешевле ratio() — отсекают явно разные имена
+        if matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score:
+            continue
+        best = max(best, matcher.ratio())
+    return best
+
+
+def _side(row) -> DuplicateSide:
+    return DuplicateSide(
+        roster_id=row.id,
+        source=row.source,
+        participant_id=row.participant_id,
+        application_id=row.application_id,
+        user_id=row.user_id,
+        team_id=row.team_id,
+        last_name=row.last_name,
+        first_name=row.first_name,
+        birth_date=row.birth_date,
+    )
+
+
+def find_pairs(
+    rows: Iterable,
+    min_score: Optional[float] = None,
+    only_applications: Optional[set] = None,
+) -> List[DuplicatePair]:
+    """
+    Вероятные дубли среди строк стартового списка. only_applications —
+    сравнивать только пары, где хотя бы одна строка из этих заявок
+    (инкрементальная проверка новой заявки).
+    """
+    min_score = settings.DEDUP_MIN_SCORE if min_score is None else min_score
+    blocks: Dict[object, List[_Entry]] = {}
+    for row in rows:
+        if row.birth_date is not None:
+            blocks.setdefault((row.competition_id, row.birth_date), []).append(_entry(row))
+
+    pairs = []
+    for block in blocks.values():
+        for a, b in combinations(block, 2):
+            if only_applications is not None and (
+                a.row.application_id not in only_applications
+                and b.row.application_id not in only_applications
+            ):
+                continue
+            if a.row.user_id is not None and a.row.user_id == b.row.user_id:
+                score, reason = 1.0, "same_user"
+            elif a.key and a.key in (b.key, b.swapped):
+                score, reason = 1.0, "exact"
+            else:
+                score, reason = _similarity(a, b, min_score), "fuzzy"
+                if score < min_score:
+                    continue
+            pairs.append(DuplicatePair(
+                score=round(score, 3), reason=reason, first=_side(a.row), second=_side(b.row),
+            ))
+    pairs.sort(key=lambda p: (-p.score, p.first.roster_id, p.second.roster_id))
+    return pairs
+
+
+def _active(r):
+    return and_(r.status != "rejected", r.application_status.not_in(INACTIVE_APPLICATION_STATUSES))
+
+
+async def competition_rows(db: AsyncSession, competition_id: int, include_inactive: bool = False):
+    r = RosterEntry
+    q = select(*r.__table__.c).where(r.competition_id == competition_id)
+    if not include_inactive:
+        q = q.where(_active(r))
+    return (await db.execute(q)).all()
+
+
+async def check_applications(db: AsyncSession, application_ids: Sequence[int]) -> List[DuplicatePair]:
+    """
+    Дубли для только что добавленных заявок: одним запросом берутся строки
+    тех же соревнований с теми же датами рождения (индекс
+    competition_id, birth_date), сравниваются только пары с новыми строками.
+    """
+    if not application_ids:
+        return []
+    r = RosterEntry
+    new = (
+        select(r.competition_id, r.birth_date)
+        .where(r.application_id.in_(application_ids), r.birth_date.is_not(None))
+        .distinct()
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(*r.__table__.c)
+        .join(new, and_(new.c.competition_id == r.competition_id, new.c.birth_date == r.birth_date))
+        .where(_active(r))
+    )).all()
+    return find_pairs(rows, only_applications=set(application_ids))
@@ -0,0 +1,150 @@
+# app/services/export.py
+"""
+Потоковая выгрузка участников соревнования (NDJSON / CSV).
+
+Строки читаются серверным курсором пачками по EXPORT_CHUNK_SIZE и сразу
+пишутся в ответ, поэтому память воркера не растёт с размером выгрузки.
+Одна строка — один участник (индивидуальный или из командной заявки).
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import literal, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+)
+from app.models.user import AdditionalInfo, User
+
+EXPORT_COLUMNS = [
+    "application_id",
+    "application_status",
+    "request_date",
+    "team_id",
+    "coach_id",
+    "kind",
+    "participant_id",
+    "participant_status",
+    "user_id",
+    "last_name",
+    "first_name",
+    "middle_name",
+    "birth_date",
+    "weight",
+    "gender",
+    "country_id",
+    "city_id",
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _individual_query(competition_id: int):
+    p = ApplicationIndividualParticipant
+    return (
+        select(
+            Application.id.label("application_id"),
+            Application.status.label("application_status"),
+            Application.request_date,
+            Application.team_id,
+            Application.user_id.label("coach_id"),
+            literal("individual").label("kind"),
+            p.id.label("participant_id"),
+            p.status.label("participant_status"),
+            User.id.label("user_id"),
+            User.last_name,
+            User.first_name,
+            User.middle_name,
+            User.birth_date,
+            AdditionalInfo.weight,
+            AdditionalInfo.gender,
+            User.country_id,
+            User.city_id,
+        )
+        .join(Application, Application.id == p.application_id)
+        .join(User, User.id == p.user_id)
+        .outerjoin(AdditionalInfo, AdditionalInfo.id == User.additional_info_id)
+        .where(Application.competition_id == competition_id)
+        .order_by(Application.id, p.id)
+    )
+
+
+def _team_query(competition_id: int):
+    p = ApplicationTeamParticipant
+    return (
+        select(
+            Application.id.label("application_id"),
+            Application.status.label("application_status"),
+            Application.request_date,
+            Application.team_id,
+            Application.user_id.label("coach_id"),
+            literal("team").label("kind"),
+            p.id.label("participant_id"),
+            p.status.label("participant_status"),
+            literal(None).label("user_id"),
+            p.last_name,
+            p.first_name,
+            p.middle_name,
+            p.birth_date,
+            p.weight,
+            literal(None).label("gender"),
+            p.country_id,
+            p.city_id,
+        )
+        .join(Application, Application.id == p.application_id)
+        .where(Application.competition_id == competition_id)
+        .order_by(Application.id, p.id)
+    )
+
+
+async def _stream_rows(competition_id: int) -> AsyncIterator[list]:
+    """Отдаёт пачки строк-маппингов: сначала индивидуальные, потом командные."""
+    async with AsyncSessionLocal() as session:
+        for query in (_individual_query(competition_id), _team_query(competition_id)):
+            result = await session.stream(
+                query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+            )
+            async for partition in result.mappings().partitions():
+                yield partition
+
+
+def _json_default(value):
+    return value.isoformat()
+
+
+async def export_ndjson(competition_id: int) -> AsyncIterator[bytes]:
+    async for rows in _stream_rows(competition_id):
+        yield "".join(
+            json.dumps(dict(row), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode()
+
+
+async def export_csv(competition_id: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    # BOM, чтобы Excel открыл кириллицу без танцев
+    buffer.write("\ufeff")
+    writer.writeheader()
+    async for rows in _stream_rows(competition_id):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+EXPORTERS = {
+    "ndjson": export_ndjson,
+    "csv": export_csv,
+}
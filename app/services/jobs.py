@@ -0,0 +1,66 @@
+# app/services/jobs.py
+"""
+Фоновые задачи внутри процесса (для больших загрузок, которые не стоит
+держать в HTTP-запросе). Состояние хранится в памяти воркера и живёт
+JOB_TTL_SECONDS; опрашивать статус нужно у того же воркера/инстанса.
+"""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "pending"          # pending | running | done | failed
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+
+
+_jobs = TTLCache(max_size=settings.JOB_MAX_KEPT, ttl=settings.JOB_TTL_SECONDS)
+_by_key = TTLCache(max_size=settings.JOB_MAX_KEPT, ttl=settings.JOB_TTL_SECONDS)
+_tasks: set = set()
+
+
+async def _run(job: Job, work: Callable[[], Awaitable[Any]]):
+    job.status = "running"
+    try:
+        job.result = await work()
+        job.status = "done"
+    except Exception as e:  # задача фоновая — ошибку отдаём через статус
+        logger.exception("background job failed", extra={"job_id": job.id, "kind": job.kind})
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = datetime.utcnow()
+
+
+def submit(kind: str, work: Callable[[], Awaitable[Any]], key: Optional[str] = None) -> Job:
+    """Запускает work() в фоне. Повторная отправка с тем же key вернёт ту же задачу."""
+    if key:
+        existing = _by_key.get((kind, key))
+        if existing is not None:
+            return existing
+    job = Job(id=uuid.uuid4().hex, kind=kind)
+    _jobs.set(job.id, job)
+    if key:
+        _by_key.set((kind, key), job)
+    task = asyncio.create_task(_run(job, work))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+def get(job_id: str) -> Optional[Job]:
+    return _jobs.get(job_id)
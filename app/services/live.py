@@ -0,0 +1,132 @@
+# app/services/live.py
+"""
+Живое табло: рассылка событий по матчам подписчикам (WebSocket / SSE).
+
+Событие сериализуется один раз и раскладывается по очередям подписчиков
+в памяти, поэтому на одно обновление матча приходится O(1) работы с БД
+независимо от числа зрителей. Темы:
+    competition:<id>        — все матчи соревнования
+    mat:<competition>:<mat> — матчи одного татами
+
+Broker — точка расширения: InMemoryBroker работает в пределах одного
+процесса (и для тестов); для нескольких воркеров его можно заменить
+реализацией поверх внешней шины через set_broker().
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from typing import Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+
+EVENTS_PUBLISHED = Counter("live_events_published_total", "Опубликовано событий табло")
+EVENTS_DROPPED = Counter("live_events_dropped_total", "Событий выброшено из-за медленных подписчиков")
+SUBSCRIBERS = Gauge("live_subscribers", "Активных подписчиков табло")
+
+
+def competition_topic(competition_id: int) -> str:
+    return f"competition:{competition_id}"
+
+
+def mat_topic(competition_id: int, mat: int) -> str:
+    return f"mat:{competition_id}:{mat}"
+
+
+class Subscription:
+    """Очередь одного подписчика. При переполнении выбрасываются самые старые события."""
+
+    def __init__(self, broker: "InMemoryBroker", topic: str, max_queue: int):
+        self.broker = broker
+        self.topic = topic
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max_queue)
+
+    def push(self, message: str):
+        if self.queue.full():
+            self.queue.get_nowait()
+            EVENTS_DROPPED.inc()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Следующее событие или None, если за timeout ничего не пришло."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def publish(self, topic: str, message: str) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, topic: str) -> Subscription:
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._topics: Dict[str, Set[Subscription]] = {}
+
+    def publish(self, topic, message):
+        for sub in tuple(self._topics.get(topic, ())):
+            sub.push(message)
+
+    def subscribe(self, topic):
+        sub = Subscription(self, topic, self.max_queue)
+        self._topics.setdefault(topic, set()).add(sub)
+        SUBSCRIBERS.inc()
+        return sub
+
+    def unsubscribe(self, subscription):
+        subs = self._topics.get(subscription.topic)
+        if subs and subscription in subs:
+            subs.discard(subscription)
+            SUBSCRIBERS.dec()
+            if not subs:
+                del self._topics[subscription.topic]
+
+
+_broker: Broker = InMemoryBroker(max_queue=settings.LIVE_SUBSCRIBER_QUEUE_SIZE)
+
+
+def get_broker() -> Broker:
+    return _broker
+
+
+def set_broker(broker: Broker) -> None:
+    global _broker
+    _broker = broker
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def publish_event(event_type: str, competition_id: Optional[int], payload: dict, mat: Optional[int] = None):
+    """Публикует событие в тему соревнования и, если задан, в тему татами."""
+    if competition_id is None:
+        return
+    message = json.dumps({"type": event_type, **payload}, default=_default, ensure_ascii=False)
+    _broker.publish(competition_topic(competition_id), message)
+    if mat is not None:
+        _broker.publish(mat_topic(competition_id, mat), message)
+    EVENTS_PUBLISHED.inc(type=event_type)
+
+
+def publish_match(event_type: str, match: dict):
+    """Событие по одному матчу (словарь колонок матча)."""
+    publish_event(
+        event_type,
+        match.get("competition_id"),
+        {"match": match},
+        mat=match.get("mat"),
+    )
@@ -0,0 +1,110 @@
+# app/services/matches.py
+"""
+Пакетное создание матчей: INSERT ... RETURNING кусками по
+MATCH_BATCH_CHUNK_SIZE строк, идемпотентность по ключу клиента.
+Вместе с ключом хранится хэш тела запроса: повтор ключа с другим
+телом — ошибка клиента (IdempotencyKeyMismatch), а не старый результат.
+"""
+import hashlib
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+from app.models.match import Match
+
+BATCH_SCOPE = "matches.batch"
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """Idempotency-Key уже использован с другим телом запроса."""
+
+    def __init__(self):
+        super().__init__("Idempotency-Key was already used with a different request body")
+
+
+def request_hash(rows: Sequence[dict]) -> str:
+    """Хэш тела пакета (порядок ключей не важен)."""
+    body = json.dumps(list(rows), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def as_row(match: Match) -> dict:
+    """Колонки ORM-объекта матча в виде словаря."""
+    return {c.key: getattr(match, c.key) for c in Match.__table__.c}
+
+
+async def insert_matches(db: AsyncSession, rows: Sequence[dict]) -> List[dict]:
+    """Вставляет матчи и возвращает их строки (по одному запросу на кусок)."""
+    created: List[dict] = []
+    chunk = settings.MATCH_BATCH_CHUNK_SIZE
+    for start in range(0, len(rows), chunk):
+        result = await db.execute(
+            insert(Match).returning(*Match.__table__.c, sort_by_parameter_order=True),
+            list(rows[start:start + chunk]),
+        )
+        created.extend(dict(r) for r in result.mappings())
+    return created
+
+
+async def load_matches(db: AsyncSession, ids: Sequence[int]) -> List[dict]:
+    """Строки матчей в порядке ids."""
+    if not ids:
+        return []
+    result = await db.execute(select(*Match.__table__.c).where(Match.id.in_(ids)))
+    by_id = {r["id"]: dict(r) for r in result.mappings()}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+async def stored_ids(db: AsyncSession, key: str, digest: str) -> Optional[List[int]]:
+    """
+    id матчей, созданных запросом с этим ключом (None — ключ не встречался).
+    IdempotencyKeyMismatch — ключ был с другим телом.
+    """
+    stored = await db.get(IdempotencyKey, (key, BATCH_SCOPE))
+    if stored is None:
+        return None
+    # у ключей, сохранённых до появления хэша, проверять нечего
+    if stored.request_hash is not None and stored.request_hash != digest:
+        raise IdempotencyKeyMismatch()
+    return json.loads(stored.resource_ids)
+
+
+async def create_matches_batch(
+    db: AsyncSession,
+    rows: Sequence[dict],
+    idempotency_key: Optional[str] = None,
+) -> Tuple[List[dict], bool]:
+    """
+    Создаёт матчи одной транзакцией; возвращает (матчи, replayed). Если
+    ключ уже использовался с тем же телом — ничего не вставляет и
+    возвращает матчи первого запроса с replayed=True.
+    """
+    digest = request_hash(rows) if idempotency_key else None
+    if idempotency_key:
+        ids = await stored_ids(db, idempotency_key, digest)
+        if ids is not None:
+            return await load_matches(db, ids), True
+
+    created = await insert_matches(db, rows)
+    if idempotency_key:
+        db.add(IdempotencyKey(
+            key=idempotency_key,
+            scope=BATCH_SCOPE,
+            resource_ids=json.dumps([m["id"] for m in created]),
+            request_hash=digest,
+        ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # параллельный повтор с тем же ключом успел раньше — отдаём его результат
+        await db.rollback()
+        ids = await stored_ids(db, idempotency_key, digest) if idempotency_key else None
+        if ids is None:
+            raise
+        return await load_matches(db, ids), True
+    return created, False
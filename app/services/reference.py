@@ -0,0 +1,160 @@
+# app/services/reference.py
+"""
+Кэш справочников: страны, города, роли, типы заявок, площадки.
+
+Справочник целиком читается одним запросом и хранится в памяти уже
+сериализованным — по куску JSON на строку, поэтому страница ответа
+собирается склейкой байтов, без ORM и pydantic. У каждой версии
+справочника свой ETag: клиент с If-None-Match получает 304 без тела.
+
+Для фильтров (country_id у городов, city_id у площадок) и поиска по
+началу названия строятся индексы в памяти. Справочник сбрасывается
+invalidate() после записи через API и, на случай правок в обход API
+или нескольких воркеров, по истечении REFERENCE_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, KeysetPage
+from app.core.response_cache import not_modified
+from app.models.application import RequestType
+from app.models.competition import Venue
+from app.models.user import City, Country, Role
+
+# справочник -> (запрос, поля для фильтра по равенству, поле для поиска по префиксу)
+SOURCES = {
+    "countries": (select(Country.id, Country.name), (), "name"),
+    "cities": (select(City.id, City.name, City.country_id), ("country_id",), "name"),
+    "roles": (select(Role.id, Role.name), (), None),
+    "request_types": (select(RequestType.id, RequestType.name), (), None),
+    "venues": (
+        select(Venue.id, Venue.name, Venue.city_id, City.name.label("city_name"))
+        .outerjoin(City, City.id == Venue.city_id),
+        ("city_id",),
+        None,
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    name: str
+    ids: List[int]
+    chunks: List[bytes]                             # JSON каждой строки
+    etag: str
+    index: Dict[str, Dict[object, List[int]]] = field(default_factory=dict)
+    names: List[tuple] = field(default_factory=list)    # (имя в нижнем регистре, позиция)
+
+    def filter(self, equals: Dict[str, object], prefix: Optional[str]) -> Optional[List[int]]:
+        """Позиции строк (в порядке id), подходящих под фильтры; None — все строки."""
+        selected = None
+        for key, value in equals.items():
+            if value is None:
+                continue
+            positions = self.index[key].get(value, [])
+            selected = positions if selected is None else sorted(set(selected) & set(positions))
+        if prefix:
+            prefix = prefix.casefold()
+            lo = bisect_left(self.names, (prefix,))
+            hi = bisect_right(self.names, (prefix + "\U0010ffff",))
+            found = sorted(pos for _, pos in self.names[lo:hi])
+            selected = found if selected is None else sorted(set(selected) & set(found))
+        return selected
+
+    def page(self, positions: Optional[Sequence[int]], page: KeysetPage) -> List[int]:
+        if positions is None:
+            start = 0 if page.after_id is None else bisect_right(self.ids, page.after_id)
+            return list(range(start, min(start + page.limit, len(self.ids))))
+        start = 0
+        if page.after_id is not None:
+            start = bisect_right(positions, page.after_id, key=self.ids.__getitem__)
+        return list(positions[start:start + page.limit])
+
+    def body(self, positions: Sequence[int]) -> bytes:
+        return b"[" + b",".join(self.chunks[p] for p in positions) + b"]"
+
+
+_datasets = TTLCache(max_size=len(SOURCES), ttl=settings.REFERENCE_CACHE_TTL_SECONDS)
+_generations: Dict[str, int] = {name: 0 for name in SOURCES}
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _serialize(row: dict) -> bytes:
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def _build(db: AsyncSession, name: str) -> Dataset:
+    query, indexed, searchable = SOURCES[name]
+    result = await db.execute(query.order_by(query.selected_columns.id))
+    rows = [dict(r) for r in result.mappings()]
+    chunks = [_serialize(r) for r in rows]
+    dataset = Dataset(
+        name=name,
+        ids=[r["id"] for r in rows],
+        chunks=chunks,
+        etag=hashlib.blake2b(b"".join(chunks), digest_size=8).hexdigest(),
+    )
+    for key in indexed:
+        index: Dict[object, List[int]] = {}
+        for pos, r in enumerate(rows):
+            index.setdefault(r[key], []).append(pos)
+        dataset.index[key] = index
+    if searchable:
+        dataset.names = sorted(((r[searchable] or "").casefold(), pos) for pos, r in enumerate(rows))
+    return dataset
+
+
+async def get_dataset(db: AsyncSession, name: str) -> Dataset:
+    dataset = _datasets.get(name)
+    if dataset is not None:
+        return dataset
+    async with _locks.setdefault(name, asyncio.Lock()):
+        dataset = _datasets.get(name)
+        if dataset is None:
+            generation = _generations[name]
+            dataset = await _build(db, name)
+            # если во время чтения справочник изменили — не кэшируем устаревшую версию
+            if generation == _generations[name]:
+                _datasets.set(name, dataset)
+    return dataset
+
+
+def invalidate(name: str):
+    _generations[name] += 1
+    _datasets.delete(name)
+
+
+async def respond(
+    request: Request,
+    db: AsyncSession,
+    name: str,
+    page: KeysetPage,
+    prefix: Optional[str] = None,
+    **equals,
+) -> Response:
+    """Страница справочника из кэша с ETag / If-None-Match и Cache-Control."""
+    dataset = await get_dataset(db, name)
+    positions = dataset.page(dataset.filter(equals, prefix), page)
+
+    variant = repr((page.after_id, page.limit, prefix, sorted(equals.items())))
+    etag = '"%s-%s"' % (dataset.etag, hashlib.blake2b(variant.encode(), digest_size=4).hexdigest())
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.REFERENCE_CACHE_MAX_AGE}",
+    }
+    if len(positions) == page.limit:
+        headers[NEXT_CURSOR_HEADER] = str(dataset.ids[positions[-1]])
+
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=dataset.body(positions), media_type="application/json", headers=headers)
@@ -0,0 +1,202 @@
+# app/services/roster.py
+"""
+Стартовый список соревнования (таблица competition_roster).
+
+Строки строятся в самой БД: один INSERT ... SELECT по обеим таблицам
+участников (индивидуальные — с users / additional_info, командные — как
+есть) с весовой и возрастной категорией, посчитанными SQL-вариантами
+правил сеток (brackets.weight_class_expr / age_category_expr). Так
+данные не проходят через Python, а таблица обновляется в той же
+транзакции, что и заявки:
+
+    add_applications      — новые заявки (только вставка);
+    refresh_applications  — заявки, у которых поменялся состав;
+    apply_status          — смена статуса (один UPDATE, как у участников);
+    rebuild               — полный пересчёт соревнования.
+
+Коммит — на вызывающем. Правки в обход API (и смена даты соревнования —
+от неё зависит возрастная категория) лечатся rebuild.
+"""
+from typing import Sequence, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+)
+from app.models.competition import Competition
+from app.models.roster import RosterEntry
+from app.models.user import AdditionalInfo, User
+from app.schemas.application import INACTIVE_APPLICATION_STATUSES
+from app.services.brackets import age_category_expr, weight_class_expr
+
+COLUMNS = (
+    "competition_id", "application_id", "source", "participant_id", "user_id", "team_id",
+    "last_name", "first_name", "middle_name", "gender", "birth_date", "weight",
+    "weight_class", "age_category", "country_id", "city_id", "rank",
+    "status", "application_status",
+)
+
+
+def _individual_select(*where):
+    p = ApplicationIndividualParticipant
+    gender = func.upper(func.substr(AdditionalInfo.gender, 1, 1))
+    return (
+        select(
+            Application.competition_id,
+            Application.id,
+            literal("individual"),
+            p.id,
+            p.user_id,
+            Application.team_id,
+            User.last_name,
+            User.first_name,
+            User.middle_name,
+            gender,
+            User.birth_date,
+            AdditionalInfo.weight,
+            weight_class_expr(gender, AdditionalInfo.weight),
+            age_category_expr(User.birth_date, Competition.start_date),
+            User.country_id,
+            User.city_id,
+            AdditionalInfo.rank,
+            p.status,
+            Application.status,
+        )
+        .join(Application, Application.id == p.application_id)
+        .join(Competition, Competition.id == Application.competition_id)
+        .join(User, User.id == p.user_id)
+        .outerjoin(AdditionalInfo, AdditionalInfo.id == User.additional_info_id)
+        .where(*where)
+    )
+
+
+def _team_select(*where):
+    p = ApplicationTeamParticipant
+    no_gender = literal(None, RosterEntry.gender.type)
+    return (
+        select(
+            Application.competition_id,
+            Application.id,
+            literal("team"),
+            p.id,
+            literal(None, RosterEntry.user_id.type),
+            Application.team_id,
+            p.last_name,
+            p.first_name,
+            p.middle_name,
+            no_gender,
+            p.birth_date,
+            p.weight,
+            weight_class_expr(no_gender, p.weight),
+            age_category_expr(p.birth_date, Competition.start_date),
+            p.country_id,
+            p.city_id,
+            literal(None, RosterEntry.rank.type),
+            p.status,
+            Application.status,
+        )
+        .join(Application, Application.id == p.application_id)
+        .join(Competition, Competition.id == Application.competition_id)
+        .where(*where)
+    )
+
+
+def insert_statement(*where):
+    """Один INSERT ... SELECT ... UNION ALL по обеим таблицам участников (where — фильтр по Application)."""
+    return insert(RosterEntry).from_select(
+        COLUMNS, union_all(_individual_select(*where), _team_select(*where))
+    )
+
+
+async def _insert(db: AsyncSession, application_filter) -> int:
+    result = await db.execute(insert_statement(application_filter))
+    return max(result.rowcount, 0)
+
+
+async def add_applications(db: AsyncSession, application_ids: Sequence[int]) -> int:
+    """Строки для только что вставленных заявок (удалять нечего)."""
+    if not application_ids:
+        return 0
+    return await _insert(db, Application.id.in_(application_ids))
+
+
+async def refresh_applications(db: AsyncSession, application_ids: Sequence[int]) -> int:
+    """Пересобрать строки заявок после изменения состава участников."""
+    if not application_ids:
+        return 0
+    await db.execute(
+        delete(RosterEntry)
+        .where(RosterEntry.application_id.in_(application_ids))
+        .execution_options(synchronize_session=False)
+    )
+    return await add_applications(db, application_ids)
+
+
+async def apply_status(
+    db: AsyncSession,
+    application_ids: Sequence[int],
+    status: str,
+    participants_follow: Tuple[str, ...],
+):
+    """
+    Зеркало applications.change_status: статус заявки и статусы участников
+    из participants_follow — одним UPDATE.
+    """
+    if not application_ids:
+        return
+    await db.execute(
+        update(RosterEntry)
+        .where(RosterEntry.application_id.in_(application_ids))
+        .values(
+            application_status=status,
+            status=case(
+                (RosterEntry.status.in_(participants_follow), status),
+                else_=RosterEntry.status,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rebuild(db: AsyncSession, competition_id: int) -> int:
+    await db.execute(
+        delete(RosterEntry)
+        .where(RosterEntry.competition_id == competition_id)
+        .execution_options(synchronize_session=False)
+    )
+    return await _insert(db, Application.competition_id == competition_id)
+
+
+def draw_list(
+    competition_id: int,
+    weight_class=None,
+    age_category=None,
+    gender=None,
+    country_id=None,
+    include_inactive: bool = False,
+):
+    """Выборка стартового списка; порядок — по индексу категории."""
+    q = select(*RosterEntry.__table__.c).where(RosterEntry.competition_id == competition_id)
+    if weight_class is not None:
+        q = q.where(RosterEntry.weight_class == weight_class)
+    if age_category is not None:
+        q = q.where(RosterEntry.age_category == age_category)
+    if gender is not None:
+        q = q.where(RosterEntry.gender == gender)
+    if country_id is not None:
+        q = q.where(RosterEntry.country_id == country_id)
+    if not include_inactive:
+        q = q.where(
+            RosterEntry.status != "rejected",
+            RosterEntry.application_status.not_in(INACTIVE_APPLICATION_STATUSES),
+        )
+    return q.order_by(
+        RosterEntry.weight_class,
+        RosterEntry.age_category,
+        RosterEntry.last_name,
+        RosterEntry.id,
+    )
@@ -0,0 +1,199 @@
+# app/services/scheduler.py
+"""
+Расписание татами: назначает матчам номер татами и время начала.
+
+Списочное планирование (list scheduling) с приоритетом по критическому пути:
+татами освобождаются по очереди (куча «время освобождения — татами»), и
+на освободившийся татами ставится готовый матч с самым длинным хвостом
+оставшихся туров его категории — так длинные сетки не становятся узким
+местом в конце дня. Ограничения:
+    порядок сетки — тур r группы начинается только после окончания всех
+        матчей тура r-1 (группа — категория, для круговых пулов — пул);
+    отдых       — между схватками спортсмена не меньше rest минут; если
+        соперник ещё неизвестен (следующий тур сетки), отдых отсчитывается
+        от конца предыдущего тура;
+    судьи       — referee_id / judge_id не могут работать на двух татами сразу.
+
+Время считается в минутах от начала соревнований; функции чистые
+(без БД), на вход — словари колонок матча.
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+@dataclass
+class Slot:
+    match_id: int
+    mat: int
+    start: int      # минуты от начала
+    end: int
+
+
+@dataclass
+class Schedule:
+    slots: List[Slot]
+    makespan: int       # окончание последнего матча
+    lower_bound: int    # max(работа / число татами, самый длинный путь по турам)
+
+
+def _group(match: dict) -> Tuple:
+    bracket = match.get("bracket") or ""
+    if bracket.startswith("pool-"):
+        return (match.get("category"), bracket)
+    return (match.get("category"),)
+
+
+def _stages(matches: Sequence[dict]) -> Dict[Tuple, List[int]]:
+    """Группа -> отсортированные номера туров."""
+    stages: Dict[Tuple, set] = {}
+    for m in matches:
+        stages.setdefault(_group(m), set()).add(m.get("round") or 0)
+    return {g: sorted(rounds) for g, rounds in stages.items()}
+
+
+def schedule(
+    matches: Iterable[dict],
+    mats: int,
+    duration: int,
+    rest: int,
+) -> Schedule:
+    """
+    Расставляет матчи по татами. duration — длительность слота матча
+    (схватка плюс подготовка), rest — минимальный отдых спортсмена, в минутах.
+    """
+    if mats < 1:
+        raise ValueError("mats must be >= 1")
+    matches = list(matches)
+    if not matches:
+        return Schedule([], 0, 0)
+
+    stages = _stages(matches)
+    stage_index = {g: {r: i for i, r in enumerate(rounds)} for g, rounds in stages.items()}
+
+    # матчи по (группа, индекс тура); сколько ещё не поставлено в туре
+    waiting: Dict[Tuple, List[dict]] = {}
+    remaining: Dict[Tuple, int] = {}
+    stage_end: Dict[Tuple, int] = {}
+    for m in matches:
+        g = _group(m)
+        key = (g, stage_index[g][m.get("round") or 0])
+        waiting.setdefault(key, []).append(m)
+        remaining[key] = remaining.get(key, 0) + 1
+
+    def tail(key) -> int:
+        g, i = key
+        return len(stages[g]) - i
+
+    athlete_ready: Dict[int, int] = {}
+    official_free: Dict[int, int] = {}
+    ready: List[Tuple] = []          # куча (-хвост, тур, id, release, match)
+
+    def release(key, at: int):
+        for m in waiting.pop(key, ()):
+            heapq.heappush(ready, (-tail(key), key[1], m["id"], at, key, m))
+
+    def earliest(key, release_at: int, m: dict) -> int:
+        t = release_at
+        for side in ("red_id", "blue_id"):
+            athlete = m.get(side)
+            if athlete is None:
+                # соперник определится в предыдущем туре — ему тоже нужен отдых
+                if key[1] > 0:
+                    t = max(t, release_at + rest)
+            else:
+                t = max(t, athlete_ready.get(athlete, 0))
+        for side in ("referee_id", "judge_id"):
+            official = m.get(side)
+            if official is not None:
+                t = max(t, official_free.get(official, 0))
+        return t
+
+    for g in stages:
+        release((g, 0), 0)
+
+    free_mats = [(0, mat) for mat in range(1, mats + 1)]
+    heapq.heapify(free_mats)
+    slots: List[Slot] = []
+
+    while ready:
+        now, mat = heapq.heappop(free_mats)
+        skipped = []
+        chosen = None
+        soonest = None
+        while ready:
+            item = heapq.heappop(ready)
+            start = earliest(item[4], item[3], item[5])
+            if start <= now:
+                chosen = item
+                break
+            skipped.append(item)
+            soonest = start if soonest is None else min(soonest, start)
+        for item in skipped:
+            heapq.heappush(ready, item)
+
+        if chosen is None:
+            # ничего нельзя начать сейчас — татами простаивает до ближайшей возможности
+            heapq.heappush(free_mats, (soonest, mat))
+            continue
+
+        _, _, match_id, _, key, m = chosen
+        end = now + duration
+        slots.append(Slot(match_id, mat, now, end))
+        heapq.heappush(free_mats, (end, mat))
+        for side in ("red_id", "blue_id"):
+            if m.get(side) is not None:
+                athlete_ready[m[side]] = end + rest
+        for side in ("referee_id", "judge_id"):
+            if m.get(side) is not None:
+                official_free[m[side]] = end
+
+        stage_end[key] = max(stage_end.get(key, 0), end)
+        remaining[key] -= 1
+        if remaining[key] == 0:
+            g, i = key
+            if i + 1 < len(stages[g]):
+                release((g, i + 1), stage_end[key])
+
+    makespan = max(s.end for s in slots)
+    longest = max(len(rounds) for rounds in stages.values()) * duration
+    lower_bound = max(-(-len(matches) * duration // mats), longest)
+    return Schedule(slots, makespan, lower_bound)
+
+
+def validate(matches: Sequence[dict], result: Schedule, rest: int) -> List[str]:
+    """Нарушения ограничений в готовом расписании (для бенчмарка и отладки)."""
+    by_id = {m["id"]: m for m in matches}
+    errors: List[str] = []
+    busy: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
+    for s in result.slots:
+        m = by_id[s.match_id]
+        busy.setdefault(("mat", s.mat), []).append((s.start, s.end))
+        for side in ("red_id", "blue_id"):
+            if m.get(side) is not None:
+                busy.setdefault(("athlete", m[side]), []).append((s.start, s.end + rest))
+        for side in ("referee_id", "judge_id"):
+            if m.get(side) is not None:
+                busy.setdefault(("official", m[side]), []).append((s.start, s.end))
+    for (kind, ident), spans in busy.items():
+        spans.sort()
+        for (s1, e1), (s2, _) in zip(spans, spans[1:]):
+            if s2 < e1:
+                errors.append(f"{kind} {ident}: overlap at {s2}")
+
+    starts = {s.match_id: s for s in result.slots}
+    last_end: Dict[Tuple, Dict[int, int]] = {}
+    for m in matches:
+        s = starts[m["id"]]
+        ends = last_end.setdefault(_group(m), {})
+        r = m.get("round") or 0
+        ends[r] = max(ends.get(r, 0), s.end)
+    stages = _stages(matches)
+    for m in matches:
+        g = _group(m)
+        rounds = stages[g]
+        i = rounds.index(m.get("round") or 0)
+        if i and starts[m["id"]].start < last_end[g][rounds[i - 1]]:
+            errors.append(f"match {m['id']}: starts before previous round ends")
+    return errors
+
@@ -0,0 +1,363 @@
+# app/services/standings.py
+"""
+Таблица результатов и медальный зачёт соревнования.
+
+Для каждого соревнования в памяти процесса хранится StandingsBook:
+результаты матчей и агрегаты, которые из них следуют, — победы,
+поражения и очки спортсменов, призёры категорий, медали по странам
+и командам. Результат матча (apply_match) сначала снимает вклад
+прежнего результата того же матча и только потом добавляет новый,
+поэтому исправление счёта или повторная доставка события агрегаты
+не портят. Призёры пересчитываются только для затронутой категории.
+
+Книга строится из таблицы matches при первом чтении или по
+POST /competitions/{id}/standings/rebuild — это же восстановление после
+рестарта. Чтение отдаёт готовый снимок без запросов к БД. Если в
+результате встретился спортсмен, которого книга не знает (страна и
+команда неизвестны), книга помечается устаревшей и перестраивается
+при следующем чтении. Книги живут в памяти воркера, как и jobs:
+результат, записанный другим воркером, сюда не доходит, поэтому книга
+старше STANDINGS_BOOK_TTL_SECONDS тоже перестраивается (как TTL у кэша
+ответов).
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.application import Application, ApplicationIndividualParticipant
+from app.models.competition import Competition
+from app.models.match import Match
+from app.models.user import User
+
+MEDALS = ("gold", "silver", "bronze")
+MEDAL_GROUPS = ("country", "team")
+
+
+@dataclass
+class Result:
+    match_id: int
+    category: Optional[str]
+    bracket: Optional[str]
+    round: Optional[int]
+    red_id: Optional[int]
+    blue_id: Optional[int]
+    winner_id: Optional[int]
+    score: Optional[int]
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Result":
+        return cls(
+            match_id=row["id"],
+            category=row.get("category"),
+            bracket=row.get("bracket"),
+            round=row.get("round"),
+            red_id=row.get("red_id"),
+            blue_id=row.get("blue_id"),
+            winner_id=row.get("winner_id"),
+            score=row.get("score"),
+        )
+
+    @property
+    def decided(self) -> bool:
+        return self.winner_id is not None
+
+    @property
+    def loser_id(self) -> Optional[int]:
+        if self.winner_id is None:
+            return None
+        if self.winner_id == self.red_id:
+            return self.blue_id
+        if self.winner_id == self.blue_id:
+            return self.red_id
+        return None
+
+
+@dataclass
+class AthleteRecord:
+    user_id: int
+    country_id: Optional[int] = None
+    team_id: Optional[int] = None
+    wins: int = 0
+    losses: int = 0
+    points: int = 0
+
+    @property
+    def matches(self) -> int:
+        return self.wins + self.losses
+
+
+def _last_round(results: List[Result]) -> List[Result]:
+    if not results:
+        return []
+    top = max(r.round or 0 for r in results)
+    return [r for r in results if (r.round or 0) == top]
+
+
+def _pool_ranking(results: List[Result]) -> List[int]:
+    """Места в пуле: победы, затем сумма очков в выигранных схватках."""
+    wins: Dict[int, int] = {}
+    points: Dict[int, int] = {}
+    for r in results:
+        for user_id in (r.red_id, r.blue_id):
+            if user_id is not None:
+                wins.setdefault(user_id, 0)
+                points.setdefault(user_id, 0)
+        if r.winner_id is not None:
+            wins[r.winner_id] = wins.get(r.winner_id, 0) + 1
+            points[r.winner_id] = points.get(r.winner_id, 0) + (r.score or 0)
+    return sorted(wins, key=lambda u: (-wins[u], -points[u], u))
+
+
+def podium(results: Iterable[Result]) -> Dict[str, List[int]]:
+    """
+    Призёры категории по её матчам:
+      олимпийка (main)  — финал даёт золото и серебро, проигравшие в полуфиналах — бронзу;
+      двойное выбывание — финал (final) и проигравший в последнем туре repechage;
+      один круговой пул — первые три места, когда сыграны все схватки.
+    Пока решающий матч не сыгран, соответствующая медаль не присуждается.
+    """
+    by_bracket: Dict[str, List[Result]] = {}
+    for r in results:
+        by_bracket.setdefault(r.bracket or "main", []).append(r)
+    medals: Dict[str, List[int]] = {m: [] for m in MEDALS}
+
+    def final(matches: List[Result]):
+        for r in _last_round(matches):
+            if r.decided:
+                medals["gold"].append(r.winner_id)
+                if r.loser_id is not None:
+                    medals["silver"].append(r.loser_id)
+
+    if "final" in by_bracket:
+        final(by_bracket["final"])
+        for r in _last_round(by_bracket.get("repechage", [])):
+            if r.loser_id is not None:
+                medals["bronze"].append(r.loser_id)
+    elif "main" in by_bracket:
+        main = by_bracket["main"]
+        final(main)
+        top = max(r.round or 0 for r in main)
+        for r in main:
+            if (r.round or 0) == top - 1 and r.loser_id is not None:
+                medals["bronze"].append(r.loser_id)
+    else:
+        pools = [b for b in by_bracket if b.startswith("pool-")]
+        if len(pools) == 1 and all(r.decided for r in by_bracket[pools[0]]):
+            ranking = _pool_ranking(by_bracket[pools[0]])
+            for medal, user_id in zip(MEDALS, ranking):
+                medals[medal].append(user_id)
+    return medals
+
+
+class StandingsBook:
+    def __init__(self, competition_id: int, athletes: Dict[int, Tuple[Optional[int], Optional[int]]]):
+        self.competition_id = competition_id
+        self.stale = False
+        self.built_at = time.monotonic()
+        self.athletes: Dict[int, AthleteRecord] = {
+            user_id: AthleteRecord(user_id, country_id, team_id)
+            for user_id, (country_id, team_id) in athletes.items()
+        }
+        self.results: Dict[int, Result] = {}
+        self.categories: Dict[str, Dict[int, Result]] = {}
+        self.podiums: Dict[str, Dict[str, List[int]]] = {}
+        self.medals: Dict[str, Dict[Optional[int], Dict[str, int]]] = {g: {} for g in MEDAL_GROUPS}
+        self._snapshots: dict = {}
+
+    # --- изменение ---
+
+    def _count(self, result: Result, sign: int):
+        if not result.decided:
+            return
+        winner = self.athletes.get(result.winner_id)
+        if winner is not None:
+            winner.wins += sign
+            winner.points += sign * (result.score or 0)
+        loser = self.athletes.get(result.loser_id)
+        if loser is not None:
+            loser.losses += sign
+
+    def _award(self, category: str, sign: int):
+        for medal, user_ids in self.podiums.get(category, {}).items():
+            for user_id in user_ids:
+                athlete = self.athletes.get(user_id)
+                for group, key in (
+                    ("country", athlete.country_id if athlete else None),
+                    ("team", athlete.team_id if athlete else None),
+                ):
+                    counts = self.medals[group].setdefault(key, dict.fromkeys(MEDALS, 0))
+                    counts[medal] += sign
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > settings.STANDINGS_BOOK_TTL_SECONDS
+
+    def knows(self, result: Result) -> bool:
+        return all(
+            user_id is None or user_id in self.athletes
+            for user_id in (result.red_id, result.blue_id, result.winner_id)
+        )
+
+    def apply(self, result: Result):
+        """Заменяет результат матча и пересчитывает затронутые агрегаты."""
+        previous = self.results.get(result.match_id)
+        if previous is not None:
+            self._count(previous, -1)
+            if previous.category != result.category and previous.category is not None:
+                self.categories[previous.category].pop(result.match_id, None)
+                self._refresh_podium(previous.category)
+        self.results[result.match_id] = result
+        self._count(result, +1)
+        if result.category is not None:
+            self.categories.setdefault(result.category, {})[result.match_id] = result
+            self._refresh_podium(result.category)
+        self._snapshots.clear()
+
+    def _refresh_podium(self, category: str):
+        self._award(category, -1)
+        matches = self.categories.get(category)
+        if matches:
+            self.podiums[category] = podium(matches.values())
+        else:
+            self.podiums.pop(category, None)
+        self._award(category, +1)
+
+    # --- чтение (снимки кешируются до следующего изменения) ---
+
+    def standings(self) -> dict:
+        if "standings" not in self._snapshots:
+            athletes = sorted(
+                (a for a in self.athletes.values() if a.matches),
+                key=lambda a: (-a.wins, -a.points, a.losses, a.user_id),
+            )
+            self._snapshots["standings"] = {
+                "competition_id": self.competition_id,
+                "matches_decided": sum(r.decided for r in self.results.values()),
+                "athletes": [
+                    {
+                        "user_id": a.user_id,
+                        "country_id": a.country_id,
+                        "team_id": a.team_id,
+                        "matches": a.matches,
+                        "wins": a.wins,
+                        "losses": a.losses,
+                        "points": a.points,
+                    }
+                    for a in athletes
+                ],
+                "podiums": [
+                    {
+                        "category": category,
+                        "gold": medals["gold"][0] if medals["gold"] else None,
+                        "silver": medals["silver"][0] if medals["silver"] else None,
+                        "bronze": medals["bronze"],
+                    }
+                    for category, medals in sorted(self.podiums.items())
+                    if any(medals.values())
+                ],
+            }
+        return self._snapshots["standings"]
+
+    def medal_table(self, by: str) -> List[dict]:
+        key = "medals:" + by
+        if key not in self._snapshots:
+            rows = [
+                {"id": group_id, **counts, "total": sum(counts.values())}
+                for group_id, counts in self.medals[by].items()
+                if any(counts.values())
+            ]
+            rows.sort(key=lambda r: (-r["gold"], -r["silver"], -r["bronze"], r["id"] is None, r["id"] or 0))
+            self._snapshots[key] = rows
+        return self._snapshots[key]
+
+
+# --- реестр книг ---
+
+_books: Dict[int, StandingsBook] = {}
+_locks: Dict[int, asyncio.Lock] = {}
+
+
+async def _load_athletes(db: AsyncSession, competition_id: int, user_ids: set) -> Dict[int, Tuple]:
+    """user_id -> (country_id, team_id) для всех спортсменов из матчей и заявок."""
+    p = ApplicationIndividualParticipant
+    teams = await db.execute(
+        select(p.user_id, Application.team_id)
+        .join(Application, Application.id == p.application_id)
+        .where(Application.competition_id == competition_id, p.status != "rejected")
+    )
+    team_of: Dict[int, Optional[int]] = {}
+    for user_id, team_id in teams.all():
+        if team_of.get(user_id) is None:
+            team_of[user_id] = team_id
+    user_ids = user_ids | set(team_of)
+    if not user_ids:
+        return {}
+    countries = await db.execute(select(User.id, User.country_id).where(User.id.in_(user_ids)))
+    return {user_id: (country_id, team_of.get(user_id)) for user_id, country_id in countries.all()}
+
+
+async def build(db: AsyncSession, competition_id: int) -> StandingsBook:
+    """Строит книгу заново из таблицы matches."""
+    result = await db.execute(
+        select(
+            Match.id,
+            Match.category,
+            Match.bracket,
+            Match.round,
+            Match.red_id,
+            Match.blue_id,
+            Match.winner_id,
+            Match.score,
+        ).where(Match.competition_id == competition_id)
+    )
+    results = [Result.from_row(dict(r)) for r in result.mappings()]
+    user_ids = {
+        user_id
+        for r in results
+        for user_id in (r.red_id, r.blue_id, r.winner_id)
+        if user_id is not None
+    }
+    book = StandingsBook(competition_id, await _load_athletes(db, competition_id, user_ids))
+    for r in results:
+        book.apply(r)
+    return book
+
+
+async def get_book(db: AsyncSession, competition_id: int, rebuild: bool = False) -> Optional[StandingsBook]:
+    """Книга соревнования (строится при первом обращении); None — соревнования нет."""
+    book = _books.get(competition_id)
+    if book is not None and not (book.stale or book.expired or rebuild):
+        return book
+    lock = _locks.setdefault(competition_id, asyncio.Lock())
+    async with lock:
+        book = _books.get(competition_id)
+        if book is not None and not (book.stale or book.expired or rebuild):
+            return book
+        if await db.get(Competition, competition_id) is None:
+            return None
+        book = await build(db, competition_id)
+        _books[competition_id] = book
+        return book
+
+
+def apply_match(match: dict):
+    """Учитывает новый результат матча в уже построенной книге."""
+    book = _books.get(match.get("competition_id"))
+    if book is None or book.stale or book.expired:
+        return
+    result = Result.from_row(match)
+    if book.knows(result):
+        book.apply(result)
+    else:
+        book.stale = True
+
+
+def invalidate(competition_id: int):
+    """Книга будет перестроена при следующем чтении (например, после пересоздания сеток)."""
+    _books.pop(competition_id, None)
+    _locks.pop(competition_id, None)
@@ -0,0 +1,54 @@
+"""
+Скорость генерации сеток на синтетическом турнире.
+
+    python -m bench.brackets --athletes 5000
+
+Меряет группировку по категориям, посев и построение сеток для каждого
+формата (без БД — вставка в matches идёт одним executemany).
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.services.brackets import Athlete, generate, group_athletes
+
+
+def synthetic_athletes(n: int, seed: int = 42):
+    rnd = random.Random(seed)
+    return [
+        Athlete(
+            user_id=i,
+            gender=rnd.choice("MF"),
+            weight=rnd.randint(42, 130),
+            birth_date=date(1990, 1, 1) + timedelta(days=rnd.randint(0, 9000)),
+            country_id=rnd.randint(1, 60),
+            rank=str(rnd.randint(0, 10)),
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--athletes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    athletes = synthetic_athletes(args.athletes)
+    on_date = date(2026, 6, 1)
+    for fmt in ("single", "double", "round_robin", "auto"):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = generate(group_athletes(athletes, on_date), fmt, seed=1)
+            best = min(best, time.perf_counter() - started)
+        matches = sum(len(m) for m in result.values())
+        print(
+            f"{fmt:>11}: {len(result):3} категорий, {matches:6} матчей, "
+            f"{best * 1000:7.1f} мс (лучшее из {args.repeat})"
+        )
+
+
+if __name__ == "__main__":
+    main()
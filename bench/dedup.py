@@ -0,0 +1,126 @@
+"""
+Поиск дублей спортсменов на синтетическом стартовом списке.
+
+    python -m bench.dedup --participants 50000 --duplicates 500
+
+Генерирует участников одного соревнования (русские имена в кириллице и
+разных латинских транслитерациях, даты рождения за 25 лет) и подмешивает
+дубли: тот же человек в другой записи — иной транслитерацией, с
+переставленными фамилией и именем или с опечаткой. Печатает время
+app.services.dedup.find_pairs, полноту по подмешанным дублям и число
+прочих найденных пар (однофамильцы-ровесники и ложные срабатывания).
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.services.dedup import find_pairs
+
+LAST_NAMES = [
+    "Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов",
+    "Новиков", "Фёдоров", "Морозов", "Волков", "Алексеев", "Лебедев", "Семёнов", "Егоров",
+    "Павлов", "Козлов", "Степанов", "Николаев", "Орлов", "Андреев", "Макаров", "Никитин",
+    "Захаров", "Зайцев", "Соловьёв", "Борисов", "Яковлев", "Григорьев", "Романов", "Воробьёв",
+    "Цой", "Хабибуллин", "Шевченко", "Щербаков", "Жуков", "Чернов", "Юсупов", "Ягудин",
+]
+FIRST_NAMES = [
+    "Александр", "Алексей", "Андрей", "Дмитрий", "Евгений", "Сергей", "Юрий", "Михаил",
+    "Николай", "Илья", "Кирилл", "Максим", "Артём", "Фёдор", "Григорий", "Хасан",
+]
+
+# разные системы транслитерации (паспортная, «бытовая», немецкая)
+SYSTEMS = [
+    {"ж": "zh", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ю": "iu", "я": "ia", "й": "i", "ё": "e", "ы": "y"},
+    {"ж": "zh", "х": "h", "ц": "tz", "ч": "ch", "ш": "sh", "щ": "sch", "ю": "yu", "я": "ya", "й": "y", "ё": "yo", "ы": "y"},
+    {"ж": "sh", "х": "ch", "ц": "z", "ч": "tsch", "ш": "sch", "щ": "schtsch", "ю": "ju", "я": "ja", "й": "j", "ё": "jo", "ы": "y"},
+]
+BASE = dict(zip("абвгдезиклмнопрстуфэъь", "abvgdeziklmnoprstufe\0\0"))
+
+
+def transliterate(text: str, system: dict) -> str:
+    out = []
+    for ch in text:
+        low = ch.lower()
+        latin = system.get(low, BASE.get(low, low)).replace("\0", "")
+        out.append(latin.capitalize() if ch.isupper() else latin)
+    return "".join(out)
+
+
+def typo(text: str, rnd: random.Random) -> str:
+    if len(text) < 4:
+        return text
+    i = rnd.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def variant(last: str, first: str, rnd: random.Random):
+    kind = rnd.choice(["translit", "translit", "swap", "typo"])
+    system = rnd.choice(SYSTEMS)
+    last_v, first_v = transliterate(last, system), transliterate(first, system)
+    if kind == "swap":
+        return first_v, last_v
+    if kind == "typo":
+        return typo(last_v, rnd), first_v
+    return last_v, first_v
+
+
+def synthetic_roster(participants: int, duplicates: int, seed: int = 42):
+    rnd = random.Random(seed)
+    start = date(1995, 1, 1)
+    rows, planted = [], set()
+
+    def add(last, first, birth, source):
+        rows.append(SimpleNamespace(
+            id=len(rows) + 1, competition_id=1, application_id=len(rows) + 1,
+            source=source, participant_id=len(rows) + 1, user_id=None, team_id=None,
+            last_name=last, first_name=first, birth_date=birth,
+        ))
+        return len(rows)
+
+    for _ in range(participants - duplicates):
+        last, first = rnd.choice(LAST_NAMES), rnd.choice(FIRST_NAMES)
+        birth = start + timedelta(days=rnd.randrange(25 * 365))
+        if rnd.random() < 0.5:
+            last, first = transliterate(last, rnd.choice(SYSTEMS)), transliterate(first, rnd.choice(SYSTEMS))
+        add(last, first, birth, "individual")
+
+    originals = rnd.sample(rows, duplicates)
+    for original in originals:
+        # дубль — запись из командной заявки, написанная по-другому
+        cyr_last = original.last_name if not original.last_name.isascii() else None
+        if cyr_last is None:
+            last_v, first_v = original.first_name, original.last_name
+        else:
+            last_v, first_v = variant(original.last_name, original.first_name, rnd)
+        copy_id = add(last_v, first_v, original.birth_date, "team")
+        planted.add((original.id, copy_id))
+    return rows, planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=50_000)
+    parser.add_argument("--duplicates", type=int, default=500)
+    parser.add_argument("--min-score", type=float, default=None)
+    args = parser.parse_args()
+
+    rows, planted = synthetic_roster(args.participants, args.duplicates)
+    started = time.perf_counter()
+    pairs = find_pairs(rows, min_score=args.min_score)
+    elapsed = time.perf_counter() - started
+
+    found = {(p.first.roster_id, p.second.roster_id) for p in pairs}
+    hit = len(planted & found)
+    print(f"{len(rows)} участников: {elapsed * 1000:.0f} мс, пар {len(pairs)}")
+    print(f"подмешанных дублей найдено {hit} из {len(planted)} ({hit / len(planted) * 100:.1f}%)")
+    print(f"прочих пар (ровесники-однофамильцы и ложные): {len(found - planted)}")
+    missed = [(a, b) for a, b in planted if (a, b) not in found][:5]
+    for a, b in missed:
+        ra, rb = rows[a - 1], rows[b - 1]
+        print(f"    пропуск: {ra.last_name} {ra.first_name} / {rb.last_name} {rb.first_name}")
+
+
+if __name__ == "__main__":
+    main()
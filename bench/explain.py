@@ -0,0 +1,130 @@
+"""
+Снимает планы выполнения (EXPLAIN) для запросов из app/routers/*.py.
+
+    python -m bench.explain                 # вывести планы
+    python -m bench.explain --write         # сохранить в bench/plans/<dialect>/
+    python -m bench.explain --check         # сравнить с сохранёнными, exit 1 при расхождении
+
+Планы снимаются с COSTS OFF, поэтому зависят от формы плана
+(какой индекс, какой join), а не от объёма данных.
+Перед запуском заполните БД: python -m bench.seed --scale medium
+"""
+import argparse
+import asyncio
+import difflib
+import sys
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.db.session import engine
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+)
+from app.models.competition import Competition, Venue
+from app.models.match import Match
+from app.models.team import Team, TeamMember
+from app.models.user import City, User
+
+PLANS_DIR = Path(__file__).parent / "plans"
+LIMIT = 100
+
+
+def router_queries():
+    """Имя -> запрос в том виде, в каком его строят роутеры."""
+    return {
+        "applications.list_by_competition": select(Application)
+            .where(Application.competition_id == 1)
+            .order_by(Application.id).limit(LIMIT),
+        "applications.list_pending": select(Application)
+            .where(Application.competition_id == 1, Application.status == "pending")
+            .order_by(Application.id).limit(LIMIT),
+        "applications.list_by_coach": select(Application)
+            .where(Application.user_id == 1)
+            .order_by(Application.id).limit(LIMIT),
+        "applications.individual_participants_in": select(ApplicationIndividualParticipant)
+            .where(ApplicationIndividualParticipant.application_id.in_([1, 2, 3])),
+        "applications.team_participants_in": select(ApplicationTeamParticipant)
+            .where(ApplicationTeamParticipant.application_id.in_([1, 2, 3])),
+        "applications.participations_of_user": select(ApplicationIndividualParticipant)
+            .where(ApplicationIndividualParticipant.user_id == 100),
+        "matches.list_by_competition": select(Match)
+            .where(Match.competition_id == 1)
+            .order_by(Match.id).limit(LIMIT),
+        "teams.my_team": select(Team).where(Team.coach_id == 1),
+        "teams.members": select(TeamMember)
+            .where(TeamMember.team_id == 1)
+            .order_by(TeamMember.id).limit(LIMIT),
+        "competitions.list": select(Competition)
+            .options(joinedload(Competition.venue).joinedload(Venue.city))
+            .order_by(Competition.id).limit(LIMIT),
+        "location.cities_by_country": select(City)
+            .where(City.country_id == 1)
+            .order_by(City.id).limit(LIMIT),
+        "auth.user_by_login": select(User).where(User.login == "user1"),
+    }
+
+
+def _explain_prefix(dialect_name: str) -> str:
+    if dialect_name == "postgresql":
+        return "EXPLAIN (COSTS OFF) "
+    return "EXPLAIN QUERY PLAN "
+
+
+async def capture_plans():
+    plans = {}
+    async with engine.connect() as conn:
+        dialect_name = conn.dialect.name
+        prefix = _explain_prefix(conn.dialect.name)
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("ANALYZE")
+        for name, stmt in router_queries().items():
+            sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            result = await conn.exec_driver_sql(prefix + sql)
+            plans[name] = "\n".join(" | ".join(str(c) for c in row) for row in result) + "\n"
+    await engine.dispose()
+    return dialect_name, plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--write", action="store_true", help="сохранить планы как эталон")
+    group.add_argument("--check", action="store_true", help="сравнить с эталоном")
+    args = parser.parse_args()
+
+    dialect_name, plans = asyncio.run(capture_plans())
+    plans_dir = PLANS_DIR / dialect_name
+
+    if args.write:
+        plans_dir.mkdir(parents=True, exist_ok=True)
+        for name, plan in plans.items():
+            (plans_dir / f"{name}.txt").write_text(plan)
+        print(f"Сохранено планов: {len(plans)} -> {plans_dir}")
+        return
+
+    if args.check:
+        changed = 0
+        for name, plan in plans.items():
+            path = plans_dir / f"{name}.txt"
+            expected = path.read_text() if path.exists() else ""
+            if plan != expected:
+                changed += 1
+                sys.stdout.writelines(difflib.unified_diff(
+                    expected.splitlines(keepends=True),
+                    plan.splitlines(keepends=True),
+                    fromfile=f"{name} (эталон)",
+                    tofile=f"{name} (сейчас)",
+                ))
+        print(f"Изменившихся планов: {changed} из {len(plans)}")
+        sys.exit(1 if changed else 0)
+
+    for name, plan in plans.items():
+        print(f"=== {name}\n{plan}")
+
+
+if __name__ == "__main__":
+    main()
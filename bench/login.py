@@ -0,0 +1,64 @@
+"""
+Пропускная способность проверки паролей при конкурентных логинах.
+
+    python -m bench.login --concurrency 64 --requests 512
+
+Сравнивает проверку прямо в event loop (как было бы при наивном переходе
+на KDF) с проверкой на пуле потоков app.core.passwords. Кроме логинов/с
+меряет задержку «пульса» event loop: насколько опаздывает таймер в 10 мс,
+пока идут логины — это то, что чувствуют все остальные запросы.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.passwords import hash_password_sync, verify_password, verify_password_sync
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def _run(mode: str, stored: str, concurrency: int, total: int):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with sem:
+            if mode == "inline":
+                verify_password_sync("secret", stored)
+            else:
+                await verify_password("secret", stored)
+
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.create_task(_heartbeat(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    lag_ms = sorted(l * 1000 for l in lags) or [0.0]
+    print(
+        f"{mode:>7}: {total / elapsed:8.1f} логинов/с, "
+        f"лаг loop p50={statistics.median(lag_ms):.1f} мс "
+        f"max={lag_ms[-1]:.1f} мс"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=256)
+    args = parser.parse_args()
+
+    stored = hash_password_sync("secret")
+    for mode in ("inline", "pool"):
+        asyncio.run(_run(mode, stored, args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
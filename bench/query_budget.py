@@ -0,0 +1,108 @@
+"""
+Проверка бюджета SQL-запросов на эндпоинт.
+
+    python -m bench.query_budget
+
+Поднимает приложение на временной SQLite-базе, заполняет её bench.seed,
+выполняет запросы к эндпоинтам и считает выполненные SQL-выражения.
+Завершается с кодом 1, если какой-то эндпоинт превысил свой бюджет —
+так N+1 и лишние перезагрузки графа видны сразу.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+_db_path = os.path.join(tempfile.mkdtemp(prefix="query-budget-"), "budget.sqlite")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_path}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+from bench.seed import seed  # noqa: E402
+
+APPLICATION = {
+    "competition_id": 1,
+    "request_type_id": 1,
+    "request_date": "2026-01-01T00:00:00",
+    "individual_participants": [{"user_id": 100}, {"user_id": 101}],
+    "team_participants": [{
+        "first_name": "Иван", "last_name": "Иванов", "weight": 73,
+        "birth_date": "2004-05-01", "country_id": 1, "city_id": 1,
+    }],
+}
+
+# (метод, путь, тело, нужен ли токен, бюджет запросов)
+BUDGETS = [
+    ("GET", "/applications/?competition_id=1", None, False, 5),
+    ("GET", "/applications/participants/individual/", None, False, 2),
+    ("GET", "/applications/participants/team/", None, False, 1),
+    ("GET", "/matches/?competition_id=1", None, False, 1),
+    ("GET", "/competitions/", None, False, 1),
+    ("GET", "/competitions/venues/", None, False, 1),
+    ("GET", "/teams/members/?team_id=1", None, False, 1),
+    ("GET", "/cities/", None, False, 1),
+    ("GET", "/users/me", None, True, 1),
+    ("GET", "/teams/my-team", None, True, 2),
+    # + INSERT ... SELECT в стартовый список (competition_roster) и выборка кандидатов в дубли
+    ("POST", "/applications/", APPLICATION, True, 9),
+    ("POST", "/applications/bulk", [APPLICATION] * 20, True, 9),
+    # командная заявка без team_member_ids: + проверка team_id
+    ("POST", "/applications/", {**APPLICATION, "team_id": 1}, True, 10),
+    # UPDATE заявки, участников обеих таблиц и стартового списка + перезагрузка графа
+    ("PATCH", "/applications/1", {"status": "approved"}, False, 9),
+    ("POST", "/applications/status", {"ids": list(range(1, 201)), "status": "rejected"}, False, 5),
+    ("GET", "/competitions/1/roster?age_category=Senior", None, False, 2),
+    ("GET", "/competitions/1/duplicates", None, False, 2),
+]
+
+# SQLite не умеет пакетный INSERT ... RETURNING с гарантированным порядком
+# строк, и SQLAlchemy вставляет по одной строке (на Postgres это один запрос
+# на таблицу). Здесь бюджет = 3 проверочных запроса + по строке на каждую вставку
+# + стартовый список и проверка дублей.
+SQLITE_OVERRIDES = {
+    "/applications/bulk": 3 + 20 * 4 + 2,
+}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def main():
+    asyncio.run(seed("small", create_all=True))
+
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "user1"})}
+    failed = 0
+    with TestClient(app) as client:
+        for method, path, body, auth, budget in BUDGETS:
+            if engine.dialect.name == "sqlite":
+                budget = SQLITE_OVERRIDES.get(path, budget)
+            counter.count = 0
+            response = client.request(
+                method, path, json=body, headers=headers if auth else None
+            )
+            used = counter.count
+            ok = response.status_code < 400 and used <= budget
+            failed += not ok
+            print(
+                f"{'OK  ' if ok else 'FAIL'} {method:5} {path:45} "
+                f"status={response.status_code} queries={used}/{budget}"
+            )
+
+    print(f"Превышений: {failed} из {len(BUDGETS)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Расписание татами на синтетическом турнире.
+
+    python -m bench.scheduler --matches 5000 --mats 10 20
+
+Строит сетки для синтетических спортсменов (bench.brackets), раздаёт
+матчам судей и планирует их на заданное число татами. Печатает время
+планирования, длительность дня против нижней оценки и загрузку татами;
+расписание проверяется на нарушения ограничений.
+"""
+import argparse
+import random
+import time
+from datetime import date
+
+from app.services.brackets import generate, group_athletes
+from app.services.scheduler import schedule, validate
+from bench.brackets import synthetic_athletes
+
+
+def synthetic_matches(target: int, officials: int, seed: int = 42):
+    """Матчи сеток (около target штук) с судьями из пула officials человек."""
+    rnd = random.Random(seed)
+    athletes = max(4, target)       # олимпийка даёт около одного матча на спортсмена
+    groups = group_athletes(synthetic_athletes(athletes, seed), date(2026, 6, 1))
+    generated = generate(groups, "single", seed=seed)
+    matches = []
+    for category_matches in generated.values():
+        for m in category_matches:
+            matches.append({
+                **m,
+                "id": len(matches) + 1,
+                "referee_id": rnd.randint(1, officials),
+                "judge_id": officials + rnd.randint(1, officials),
+            })
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=5000)
+    parser.add_argument("--mats", type=int, nargs="+", default=[10, 20])
+    parser.add_argument("--officials", type=int, default=40, help="судей каждого вида")
+    parser.add_argument("--duration", type=int, default=6, help="слот матча, мин")
+    parser.add_argument("--rest", type=int, default=15, help="отдых спортсмена, мин")
+    args = parser.parse_args()
+
+    matches = synthetic_matches(args.matches, args.officials)
+    print(f"{len(matches)} матчей, судей {args.officials}+{args.officials}")
+    for mats in args.mats:
+        started = time.perf_counter()
+        result = schedule(matches, mats, args.duration, args.rest)
+        elapsed = time.perf_counter() - started
+        errors = validate(matches, result, args.rest)
+        busy = len(matches) * args.duration / (mats * result.makespan)
+        print(
+            f"{mats:3} татами: {elapsed * 1000:8.1f} мс, день {result.makespan / 60:5.1f} ч "
+            f"(нижняя оценка {result.lower_bound / 60:5.1f} ч, "
+            f"+{(result.makespan / result.lower_bound - 1) * 100:4.1f}%), "
+            f"загрузка {busy * 100:4.1f}%, нарушений {len(errors)}"
+        )
+        for e in errors[:5]:
+            print("   ", e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Пропускная способность валидации и сериализации схем (pydantic v2).
+
+    python -m bench.schemas --items 10000
+
+Для каждой схемы на N одинаковых по форме элементах меряется:
+    validate loop     — Schema.model_validate на каждый элемент;
+    validate adapter  — TypeAdapter(List[Schema]).validate_python одним вызовом;
+    validate json     — тот же адаптер из байтов JSON (тело запроса);
+    dump loop         — model_dump на каждый элемент;
+    dump adapter      — адаптер.dump_python(mode="json");
+    dump json         — адаптер.dump_json.
+Печатается тысяч элементов в секунду (лучшее из --repeat).
+"""
+import argparse
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.schemas.application import (
+    APPLICATION_CREATE_LIST,
+    APPLICATION_READ_LIST,
+    ApplicationCreate,
+    ApplicationRead,
+)
+from app.schemas.match import MATCH_CREATE_LIST, MATCH_READ_LIST, MatchCreate, MatchRead
+from app.schemas.team import TeamMemberRead
+from app.schemas.user import UserRead
+
+USER = {
+    "id": 1, "first_name": "Иван", "last_name": "Иванов", "middle_name": None,
+    "login": "ivanov", "phone": "+70000000000", "email": "ivanov@example.com",
+    "organization": "Клуб", "role_id": 1, "city_id": 1, "country_id": 1,
+}
+TEAM_PARTICIPANT = {
+    "application_id": 1, "first_name": "Пётр", "last_name": "Петров", "middle_name": None,
+    "weight": 73, "birth_date": "2004-05-01", "country_id": 1, "city_id": 1, "status": "pending",
+}
+APPLICATION_CREATE = {
+    "competition_id": 1, "request_type_id": 1, "request_date": "2026-01-01T00:00:00",
+    "individual_participants": [{"user_id": 100}, {"user_id": 101}],
+    "team_participants": [TEAM_PARTICIPANT],
+}
+APPLICATION_READ = {
+    **APPLICATION_CREATE, "id": 1, "user_id": 1, "team_id": None, "status": "pending",
+    "user": USER,
+    "individual_participants": [
+        {"id": 1, "application_id": 1, "user_id": 100, "status": "pending", "user": USER},
+        {"id": 2, "application_id": 1, "user_id": 101, "status": "pending", "user": USER},
+    ],
+    "team_participants": [{**TEAM_PARTICIPANT, "id": 1}],
+}
+MATCH_CREATE = {
+    "red_id": 1, "blue_id": 2, "competition_id": 1, "match_time": "2026-01-01T10:00:00",
+    "referee_id": 3, "judge_id": 4, "category": "M Senior -73", "bracket": "main",
+    "round": 1, "position": 0, "mat": 1,
+}
+TEAM_MEMBER = {
+    "id": 1, "team_id": 1, "first_name": "Пётр", "last_name": "Петров", "middle_name": None,
+    "weight": 73, "birth_date": "2004-05-01", "country_id": 1, "city_id": 1,
+}
+
+# (схема, готовый адаптер списка, пример элемента)
+CASES = [
+    (UserRead, TypeAdapter(List[UserRead]), USER),
+    (TeamMemberRead, TypeAdapter(List[TeamMemberRead]), TEAM_MEMBER),
+    (MatchCreate, MATCH_CREATE_LIST, MATCH_CREATE),
+    (MatchRead, MATCH_READ_LIST, {**MATCH_CREATE, "id": 1, "version": 1, "score": 5}),
+    (ApplicationCreate, APPLICATION_CREATE_LIST, APPLICATION_CREATE),
+    (ApplicationRead, APPLICATION_READ_LIST, APPLICATION_READ),
+]
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'схема':>18} {'операция':>17} {'тыс. эл./с':>11}")
+    for schema, adapter, sample in CASES:
+        data = [dict(sample) for _ in range(args.items)]
+        raw = TypeAdapter(List[dict]).dump_json(data)
+        models = adapter.validate_python(data)
+        measurements = [
+            ("validate loop", lambda: [schema.model_validate(d) for d in data]),
+            ("validate adapter", lambda: adapter.validate_python(data)),
+            ("validate json", lambda: adapter.validate_json(raw)),
+            ("dump loop", lambda: [m.model_dump(mode="json") for m in models]),
+            ("dump adapter", lambda: adapter.dump_python(models, mode="json")),
+            ("dump json", lambda: adapter.dump_json(models)),
+        ]
+        for name, fn in measurements:
+            elapsed = best_of(args.repeat, fn)
+            print(f"{schema.__name__:>18} {name:>17} {args.items / elapsed / 1000:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Генератор тестовых данных для локальной БД (Postgres или SQLite).
+
+    python -m bench.seed --scale small
+    python -m bench.seed --scale large --create-all
+
+Пишет напрямую через Core insert (executemany), без ORM-объектов.
+"""
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import models  # noqa: F401 — регистрация всех таблиц в metadata
+from app.db.base import Base
+from app.db.session import engine
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+    RequestType,
+)
+from app.models.competition import Competition, Venue
+from app.models.match import Match
+from app.models.team import Team, TeamMember
+from app.models.user import AdditionalInfo, City, Country, Role, User
+from app.services import roster
+
+SCALES = {
+    "small": dict(users=500, coaches=20, competitions=5, applications=1_000, matches=500),
+    "medium": dict(users=5_000, coaches=200, competitions=20, applications=10_000, matches=5_000),
+    "large": dict(users=50_000, coaches=2_000, competitions=50, applications=100_000, matches=50_000),
+}
+
+STATUSES = ["pending", "approved", "rejected"]
+CHUNK = 5_000
+
+
+async def _insert(conn, model, rows):
+    for i in range(0, len(rows), CHUNK):
+        await conn.execute(insert(model), rows[i:i + CHUNK])
+
+
+async def seed(scale: str = "small", create_all: bool = False, seed_value: int = 42):
+    sizes = SCALES[scale]
+    rnd = random.Random(seed_value)
+
+    async with engine.begin() as conn:
+        if create_all:
+            await conn.run_sync(Base.metadata.create_all)
+
+        countries = [{"id": i, "name": f"Country {i}"} for i in range(1, 31)]
+        cities = [
+            {"id": i, "name": f"City {i}", "country_id": rnd.randint(1, 30)}
+            for i in range(1, 301)
+        ]
+        await _insert(conn, Country, countries)
+        await _insert(conn, City, cities)
+        await _insert(conn, Role, [
+            {"id": 1, "name": "athlete"},
+            {"id": 2, "name": "coach"},
+            {"id": 3, "name": "referee"},
+        ])
+        await _insert(conn, RequestType, [
+            {"id": 1, "name": "individual"},
+            {"id": 2, "name": "team"},
+        ])
+
+        n_users = sizes["users"]
+        await _insert(conn, AdditionalInfo, [
+            {
+                "id": i,
+                "height": rnd.randint(150, 200),
+                "weight": rnd.randint(45, 120),
+                "rank": str(rnd.randint(0, 10)),
+                "gender": rnd.choice(["M", "F"]),
+            }
+            for i in range(1, n_users + 1)
+        ])
+        users = []
+        for i in range(1, n_users + 1):
+            city = cities[rnd.randrange(len(cities))]
+            users.append({
+                "id": i,
+                "first_name": f"Name{i % 977}",
+                "last_name": f"Surname{i % 1999}",
+                "birth_date": date(1985, 1, 1) + timedelta(days=rnd.randint(0, 9000)),
+                "login": f"user{i}",
+                "password": f"password{i}",
+                "role_id": 2 if i <= sizes["coaches"] else 1,
+                "country_id": city["country_id"],
+                "city_id": city["id"],
+                "additional_info_id": i,
+            })
+        await _insert(conn, User, users)
+
+        coaches = range(1, sizes["coaches"] + 1)
+        await _insert(conn, Team, [
+            {"id": c, "name": f"Команда {c}", "coach_id": c} for c in coaches
+        ])
+        await _insert(conn, TeamMember, [
+            {
+                "team_id": rnd.choice(coaches),
+                "first_name": f"Member{i}",
+                "last_name": f"Surname{i % 1999}",
+                "weight": rnd.randint(45, 120),
+                "birth_date": date(1990, 1, 1) + timedelta(days=rnd.randint(0, 7000)),
+                "country_id": rnd.randint(1, 30),
+                "city_id": rnd.randint(1, 300),
+            }
+            for i in range(sizes["coaches"] * 10)
+        ])
+
+        await _insert(conn, Venue, [
+            {"id": i, "name": f"Arena {i}", "city_id": rnd.randint(1, 300)}
+            for i in range(1, 11)
+        ])
+        start = datetime(2026, 1, 1)
+        await _insert(conn, Competition, [
+            {
+                "id": i,
+                "name": f"Championship {i}",
+                "organizer": "Federation",
+                "start_date": start + timedelta(days=7 * i),
+                "venue_id": rnd.randint(1, 10),
+                "status": "open",
+            }
+            for i in range(1, sizes["competitions"] + 1)
+        ])
+
+        n_apps = sizes["applications"]
+        applications, individual, team = [], [], []
+        for i in range(1, n_apps + 1):
+            coach = rnd.choice(coaches)
+            applications.append({
+                "id": i,
+                "request_date": start + timedelta(minutes=i),
+                "competition_id": rnd.randint(1, sizes["competitions"]),
+                "request_type_id": 1 if i % 3 else 2,
+                "team_id": coach,
+                "user_id": coach,
+                "status": rnd.choice(STATUSES),
+            })
+            if i % 3:
+                individual.append({
+                    "application_id": i,
+                    "user_id": rnd.randint(sizes["coaches"] + 1, n_users),
+                    "status": "pending",
+                })
+            else:
+                team.append({
+                    "application_id": i,
+                    "first_name": f"Member{i}",
+                    "last_name": f"Surname{i % 1999}",
+                    "weight": rnd.randint(45, 120),
+                    "birth_date": date(1990, 1, 1) + timedelta(days=rnd.randint(0, 7000)),
+                    "country_id": rnd.randint(1, 30),
+                    "city_id": rnd.randint(1, 300),
+                    "status": "pending",
+                })
+        await _insert(conn, Application, applications)
+        await _insert(conn, ApplicationIndividualParticipant, individual)
+        await _insert(conn, ApplicationTeamParticipant, team)
+        for competition_id in range(1, sizes["competitions"] + 1):
+            await roster.rebuild(conn, competition_id)
+
+        athletes = range(sizes["coaches"] + 1, n_users + 1)
+        matches = []
+        for i in range(sizes["matches"]):
+            red, blue = rnd.sample(athletes, 2)
+            matches.append({
+                "red_id": red,
+                "blue_id": blue,
+                "winner_id": rnd.choice([red, blue, None]),
+                "competition_id": rnd.randint(1, sizes["competitions"]),
+                "match_time": start + timedelta(minutes=5 * i),
+                "score": rnd.randint(0, 10),
+            })
+        await _insert(conn, Match, matches)
+
+        if conn.dialect.name == "postgresql":
+            # явные id в insert не двигают sequence — выравниваем
+            for table in ("countries", "cities", "roles", "request_types", "additional_info",
+                          "users", "teams", "venues", "competitions", "applications"):
+                await conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT max(id) FROM {table}))"
+                )
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--create-all", action="store_true", help="создать таблицы через metadata")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(seed(args.scale, args.create_all, args.seed))
+
+
+if __name__ == "__main__":
+    main()
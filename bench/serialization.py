@@ -0,0 +1,119 @@
+"""
+Сериализация списков: response_model (pydantic) против быстрого пути.
+
+    python -m bench.serialization --items 10000
+
+Для каждой схемы строится список из N объектов (ORM-объекты без БД:
+заявки с тренером и участниками, матчи) и меряется:
+    pydantic — валидация списка готовым TypeAdapter + dump в JSON-режиме +
+               json.dumps, как это делает FastAPI с response_model;
+    fast     — app.schemas.fast: скомпилированный сериализатор + orjson.
+Проверяется, что оба пути дают одинаковый JSON.
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.application import (
+    Application,
+    ApplicationIndividualParticipant,
+    ApplicationTeamParticipant,
+)
+from app.models.match import Match
+from app.models.user import User
+from app.schemas.application import APPLICATION_READ_LIST, ApplicationRead
+from app.schemas.fast import dumps, serialize_many
+from app.schemas.match import MATCH_READ_LIST, MatchRead
+
+
+def _user(i: int) -> User:
+    return User(
+        id=i, first_name=f"Имя{i}", last_name=f"Фамилия{i}", middle_name=None,
+        login=f"user{i}", phone="+70000000000", email=f"user{i}@example.com",
+        organization="Клуб", role_id=1, city_id=1, country_id=1,
+    )
+
+
+def synthetic_applications(n: int) -> List[Application]:
+    start = datetime(2026, 1, 1)
+    items = []
+    for i in range(1, n + 1):
+        items.append(Application(
+            id=i, competition_id=1, request_type_id=1, team_id=None, user_id=1,
+            request_date=start + timedelta(minutes=i), status="pending",
+            user=_user(1),
+            individual_participants=[
+                ApplicationIndividualParticipant(
+                    id=i * 10 + k, application_id=i, user_id=100 + k, status="pending",
+                    user=_user(100 + k),
+                )
+                for k in range(2)
+            ],
+            team_participants=[
+                ApplicationTeamParticipant(
+                    id=i, application_id=i, first_name="Иван", last_name="Иванов",
+                    middle_name=None, weight=73, birth_date=date(2004, 5, 1),
+                    country_id=1, city_id=1, status="pending",
+                )
+            ],
+        ))
+    return items
+
+
+def synthetic_matches(n: int) -> List[Match]:
+    start = datetime(2026, 1, 1)
+    return [
+        Match(
+            id=i, red_id=i, blue_id=i + 1, winner_id=None, competition_id=1,
+            comment=None, match_time=start + timedelta(minutes=6 * i), score=None,
+            referee_id=1, judge_id=2, category="M Senior -73", bracket="main",
+            round=1, position=i, mat=1 + i % 10, version=1,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def pydantic_path(adapter: TypeAdapter, items) -> bytes:
+    validated = adapter.validate_python(items, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode()
+
+
+def fast_path(schema, items) -> bytes:
+    return dumps(serialize_many(schema, items))
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("ApplicationRead", ApplicationRead, APPLICATION_READ_LIST, synthetic_applications(args.items)),
+        ("MatchRead", MatchRead, MATCH_READ_LIST, synthetic_matches(args.items)),
+    ]
+    for name, schema, adapter, items in cases:
+        assert json.loads(pydantic_path(adapter, items)) == json.loads(fast_path(schema, items))
+        slow = best_of(args.repeat, lambda: pydantic_path(adapter, items))
+        fast = best_of(args.repeat, lambda: fast_path(schema, items))
+        print(
+            f"{name:>16} x{args.items}: pydantic {slow * 1000:7.1f} мс, "
+            f"fast {fast * 1000:7.1f} мс, ускорение x{slow / fast:4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()